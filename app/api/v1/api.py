@@ -4,9 +4,19 @@ API роутер версии 1
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import tasks
+from app.api.v1.endpoints import profiles, tags, tasks
+from app.core.config import settings
 
 api_router = APIRouter()
 
 # Подключение endpoints для задач
 api_router.include_router(tasks.router, prefix="/tasks", tags=["Задачи"])
+
+# Подключение endpoints для тегов
+api_router.include_router(tags.router, prefix="/tags", tags=["Теги"])
+
+# Подключение endpoints для отчетов профилирования (только при включенном профилировании)
+if settings.profiling_enabled:
+    api_router.include_router(
+        profiles.router, prefix="/profiles", tags=["Профилирование"]
+    )
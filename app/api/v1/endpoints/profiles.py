@@ -0,0 +1,47 @@
+"""
+API endpoints для получения отчетов профилирования
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import profile_store
+
+router = APIRouter()
+
+
+@router.get(
+    "/{profile_id}",
+    summary="Получить отчет профилирования",
+    description=(
+        "Возвращает дерево вызовов профилированного запроса в текстовом виде "
+        "или статистику в формате pstats (format=pstats)"
+    ),
+    response_class=PlainTextResponse,
+)
+async def get_profile(
+    profile_id: str,
+    report_format: str = Query(
+        "text", alias="format", pattern="^(text|pstats)$", description="Формат отчета"
+    ),
+) -> Response:
+    """
+    Получение отчета профилирования по ID
+    """
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Отчет профилирования с ID {profile_id} не найден",
+        )
+
+    report, raw_stats = profile
+    if report_format == "pstats":
+        return Response(
+            content=raw_stats,
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f'attachment; filename="{profile_id}.pstats"'
+            },
+        )
+    return PlainTextResponse(report)
@@ -0,0 +1,149 @@
+"""
+API endpoints для работы с тегами
+"""
+
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.serialization import MsgPackRoute, render
+from app.crud import tag as tag_crud
+from app.schemas.tag import TagCreate, TagResponse, TagUpdate
+
+
+class TagListResponse(BaseModel):
+    """
+    Схема ответа для списка тегов с метаданными
+    """
+
+    tags: List[TagResponse]
+    skip: int
+    limit: int
+
+
+router = APIRouter(route_class=MsgPackRoute)
+
+
+def _tag_not_found(tag_id: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Тег с ID {tag_id} не найден",
+    )
+
+
+def _tag_exists(name: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Тег '{name}' уже существует",
+    )
+
+
+@router.post(
+    "/",
+    response_model=TagResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать новый тег",
+    description="Создает новый тег с указанным названием",
+)
+async def create_tag(
+    request: Request, tag_data: TagCreate, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Создание нового тега
+    """
+    try:
+        tag = await tag_crud.create_tag(db=db, tag_data=tag_data)
+    except IntegrityError as exc:
+        raise _tag_exists(tag_data.name) from exc
+    return render(
+        request, TagResponse.model_validate(tag), status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.get(
+    "/",
+    response_model=TagListResponse,
+    summary="Получить список тегов",
+    description="Возвращает список тегов, упорядоченный по названию",
+)
+async def get_tags(
+    request: Request,
+    skip: int = Query(0, ge=0, description="Количество пропускаемых записей"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Максимальное количество возвращаемых записей"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Получение списка тегов
+    """
+    tags = await tag_crud.get_tags(db=db, skip=skip, limit=limit)
+    return render(
+        request,
+        TagListResponse(
+            tags=[TagResponse.model_validate(tag) for tag in tags],
+            skip=skip,
+            limit=limit,
+        ),
+    )
+
+
+@router.get(
+    "/{tag_id}",
+    response_model=TagResponse,
+    summary="Получить тег по ID",
+    description="Возвращает тег с указанным идентификатором",
+)
+async def get_tag(
+    request: Request, tag_id: int, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Получение тега по ID
+    """
+    tag = await tag_crud.get_tag(db=db, tag_id=tag_id)
+    if not tag:
+        raise _tag_not_found(tag_id)
+    return render(request, TagResponse.model_validate(tag))
+
+
+@router.put(
+    "/{tag_id}",
+    response_model=TagResponse,
+    summary="Переименовать тег",
+    description="Переименовывает тег с указанным идентификатором",
+)
+async def update_tag(
+    request: Request,
+    tag_id: int,
+    tag_data: TagUpdate,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Переименование тега
+    """
+    try:
+        tag = await tag_crud.update_tag(db=db, tag_id=tag_id, tag_data=tag_data)
+    except IntegrityError as exc:
+        raise _tag_exists(tag_data.name) from exc
+    if not tag:
+        raise _tag_not_found(tag_id)
+    return render(request, TagResponse.model_validate(tag))
+
+
+@router.delete(
+    "/{tag_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Удалить тег",
+    description="Удаляет тег с указанным идентификатором и снимает его со всех задач",
+)
+async def delete_tag(tag_id: int, db: AsyncSession = Depends(get_db)) -> None:
+    """
+    Удаление тега
+    """
+    deleted = await tag_crud.delete_tag(db=db, tag_id=tag_id)
+    if not deleted:
+        raise _tag_not_found(tag_id)
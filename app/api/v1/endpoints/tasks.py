@@ -2,15 +2,34 @@
 API endpoints для работы с задачами
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import task_list_flight
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.profiling import is_profiling
+from app.core.serialization import (
+    MsgPackRoute,
+    encode,
+    negotiated_response,
+    render,
+    response_media_type,
+)
 from app.crud import task as task_crud
-from app.schemas.task import TaskCreate, TaskResponse, TaskUpdate
+from app.schemas.tag import normalize_tag_names
+from app.schemas.task import (
+    TaskClaimRequest,
+    TaskClaimResponse,
+    TaskCreate,
+    TaskLeaseExtendRequest,
+    TaskLeaseReleaseRequest,
+    TaskResponse,
+    TaskUpdate,
+)
 
 
 class TaskListResponse(BaseModel):
@@ -24,7 +43,8 @@ class TaskListResponse(BaseModel):
     limit: int
 
 
-router = APIRouter()
+# Все endpoints принимают и возвращают данные в формате JSON или MessagePack
+router = APIRouter(route_class=MsgPackRoute)
 
 
 @router.post(
@@ -35,13 +55,15 @@ router = APIRouter()
     description="Создает новую задачу с указанными параметрами",
 )
 async def create_task(
-    task_data: TaskCreate, db: AsyncSession = Depends(get_db)
-) -> TaskResponse:
+    request: Request, task_data: TaskCreate, db: AsyncSession = Depends(get_db)
+) -> Response:
     """
     Создание новой задачи
     """
     task = await task_crud.create_task(db=db, task_data=task_data)
-    return TaskResponse.model_validate(task)
+    return render(
+        request, TaskResponse.model_validate(task), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -50,7 +72,9 @@ async def create_task(
     summary="Получить задачу по ID",
     description="Возвращает задачу с указанным идентификатором",
 )
-async def get_task(task_id: int, db: AsyncSession = Depends(get_db)) -> TaskResponse:
+async def get_task(
+    request: Request, task_id: int, db: AsyncSession = Depends(get_db)
+) -> Response:
     """
     Получение задачи по ID
     """
@@ -60,7 +84,22 @@ async def get_task(task_id: int, db: AsyncSession = Depends(get_db)) -> TaskResp
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Задача с ID {task_id} не найдена",
         )
-    return TaskResponse.model_validate(task)
+    return render(request, TaskResponse.model_validate(task))
+
+
+def _parse_tags(values: Optional[List[str]]) -> Tuple[str, ...]:
+    """
+    Разбор фильтра по тегам из параметров запроса (повторяющихся или через запятую)
+    """
+    if not values:
+        return ()
+    names = [name for value in values for name in value.split(",") if name.strip()]
+    try:
+        return tuple(sorted(normalize_tag_names(names)))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+        ) from exc
 
 
 @router.get(
@@ -70,27 +109,60 @@ async def get_task(task_id: int, db: AsyncSession = Depends(get_db)) -> TaskResp
     description="Возвращает список задач с возможностью фильтрации и пагинации",
 )
 async def get_tasks(
+    request: Request,
     skip: int = Query(0, ge=0, description="Количество пропускаемых записей"),
     limit: int = Query(
         100, ge=1, le=1000, description="Максимальное количество возвращаемых записей"
     ),
     completed: Optional[bool] = Query(None, description="Фильтр по статусу выполнения"),
+    tags: Optional[List[str]] = Query(
+        None, description="Теги, которые должны быть у задачи все (через запятую)"
+    ),
+    any_tags: Optional[List[str]] = Query(
+        None,
+        description="Теги, хотя бы один из которых должен быть у задачи (через запятую)",
+    ),
     db: AsyncSession = Depends(get_db),
-) -> TaskListResponse:
+) -> Response:
     """
     Получение списка задач с фильтрацией и пагинацией
+
+    Одинаковые конкурентные запросы объединяются: выборка из базы данных
+    и сериализация ответа выполняются один раз для всех ожидающих клиентов.
+    Профилируемые запросы (X-Profile) всегда выполняются отдельно.
     """
-    tasks = await task_crud.get_tasks(
-        db=db, skip=skip, limit=limit, completed=completed
-    )
-    total = await task_crud.get_tasks_count(db=db, completed=completed)
 
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(task) for task in tasks],
-        total=total,
-        skip=skip,
-        limit=limit,
-    )
+    media_type = response_media_type(request)
+    all_of = _parse_tags(tags)
+    any_of = _parse_tags(any_tags)
+
+    async def load() -> bytes:
+        tasks = await task_crud.get_tasks(
+            db=db,
+            skip=skip,
+            limit=limit,
+            completed=completed,
+            tags=all_of,
+            any_tags=any_of,
+        )
+        total = await task_crud.get_tasks_count(
+            db=db, completed=completed, tags=all_of, any_tags=any_of
+        )
+
+        response = TaskListResponse(
+            tasks=[TaskResponse.model_validate(task) for task in tasks],
+            total=total,
+            skip=skip,
+            limit=limit,
+        )
+        return encode(response, media_type)
+
+    if settings.list_coalescing_enabled and not is_profiling():
+        key = (skip, limit, completed, all_of, any_of, media_type)
+        body = await task_list_flight.do(key, load)
+    else:
+        body = await load()
+    return negotiated_response(body, media_type)
 
 
 @router.put(
@@ -100,8 +172,11 @@ async def get_tasks(
     description="Обновляет задачу с указанным идентификатором",
 )
 async def update_task(
-    task_id: int, task_data: TaskUpdate, db: AsyncSession = Depends(get_db)
-) -> TaskResponse:
+    request: Request,
+    task_id: int,
+    task_data: TaskUpdate,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
     """
     Обновление задачи
     """
@@ -111,7 +186,7 @@ async def update_task(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Задача с ID {task_id} не найдена",
         )
-    return TaskResponse.model_validate(task)
+    return render(request, TaskResponse.model_validate(task))
 
 
 @router.delete(
@@ -130,3 +205,97 @@ async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Задача с ID {task_id} не найдена",
         )
+
+
+@router.post(
+    "/claim",
+    response_model=TaskClaimResponse,
+    summary="Арендовать свободные задачи",
+    description=(
+        "Атомарно арендует до limit невыполненных задач для воркера "
+        "на указанное время. Задачи с истекшей арендой снова становятся доступными"
+    ),
+)
+async def claim_tasks(
+    request: Request, claim_data: TaskClaimRequest, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """
+    Аренда свободных задач воркером
+    """
+    tasks = await task_crud.claim_tasks(
+        db=db,
+        worker_id=claim_data.worker_id,
+        limit=claim_data.limit,
+        lease_seconds=claim_data.lease_seconds,
+    )
+    return render(
+        request,
+        TaskClaimResponse(
+            tasks=[TaskResponse.model_validate(task) for task in tasks],
+            worker_id=claim_data.worker_id,
+        ),
+    )
+
+
+async def _raise_lease_error(db: AsyncSession, task_id: int) -> None:
+    """
+    Формирование ошибки для неудачной операции с арендой задачи
+    """
+    if not await task_crud.get_task(db=db, task_id=task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Задача с ID {task_id} не найдена",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Воркер не владеет арендой задачи с ID {task_id}",
+    )
+
+
+@router.post(
+    "/{task_id}/lease/extend",
+    response_model=TaskResponse,
+    summary="Продлить аренду задачи",
+    description="Продлевает действующую аренду задачи воркером (heartbeat)",
+)
+async def extend_task_lease(
+    request: Request,
+    task_id: int,
+    lease_data: TaskLeaseExtendRequest,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Продление аренды задачи
+    """
+    task = await task_crud.extend_task_lease(
+        db=db,
+        task_id=task_id,
+        worker_id=lease_data.worker_id,
+        lease_seconds=lease_data.lease_seconds,
+    )
+    if not task:
+        await _raise_lease_error(db, task_id)
+    return render(request, TaskResponse.model_validate(task))
+
+
+@router.post(
+    "/{task_id}/lease/release",
+    response_model=TaskResponse,
+    summary="Освободить аренду задачи",
+    description="Освобождает аренду задачи, делая ее снова доступной для воркеров",
+)
+async def release_task_lease(
+    request: Request,
+    task_id: int,
+    lease_data: TaskLeaseReleaseRequest,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Освобождение аренды задачи
+    """
+    task = await task_crud.release_task_lease(
+        db=db, task_id=task_id, worker_id=lease_data.worker_id
+    )
+    if not task:
+        await _raise_lease_error(db, task_id)
+    return render(request, TaskResponse.model_validate(task))
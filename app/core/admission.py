@@ -0,0 +1,195 @@
+"""
+Контроль допуска запросов и сброс нагрузки при перегрузке
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.coherence import ActivityBoard, activity_board
+from app.core.config import settings
+
+# Методы, относящиеся к классу запросов на чтение
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ConcurrencyLimiter:
+    """
+    Ограничение количества одновременно выполняемых запросов
+
+    Запросы сверх лимита ожидают в ограниченной очереди не дольше
+    queue_timeout секунд. Если очередь заполнена или время ожидания
+    истекло, запрос отклоняется сразу, не дожидаясь блокировки базы данных.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        # Счетчики для мониторинга
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    async def acquire(self) -> bool:
+        """
+        Получение разрешения на выполнение запроса
+
+        Returns:
+            True, если запрос допущен, False - если его следует отклонить
+        """
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.shed_queue_full += 1
+                return False
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.shed_timeout += 1
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """
+        Освобождение разрешения после завершения запроса
+        """
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика работы для мониторинга
+        """
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "shed": self.shed_queue_full + self.shed_timeout,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+class AdmissionController:
+    """
+    Раздельные лимиты для запросов на чтение и на запись
+
+    Если передан общий учет запросов board, количество выполняющихся запросов
+    публикуется в нем для других воркеров.
+    """
+
+    def __init__(
+        self,
+        read_limit: int,
+        write_limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        board: Optional[ActivityBoard] = None,
+    ):
+        self.reads = ConcurrencyLimiter(read_limit, queue_size, queue_timeout)
+        self.writes = ConcurrencyLimiter(write_limit, queue_size, queue_timeout)
+        self.board = board
+
+    def limiter_for(self, method: str) -> ConcurrencyLimiter:
+        """
+        Выбор лимита по HTTP методу запроса
+        """
+        return self.reads if method in READ_METHODS else self.writes
+
+    def is_idle(self) -> bool:
+        """
+        Проверка отсутствия выполняющихся и ожидающих запросов
+        """
+        return not (
+            self.reads.active
+            or self.reads.waiting
+            or self.writes.active
+            or self.writes.waiting
+        )
+
+    def publish(self) -> None:
+        """
+        Публикация количества запросов процесса в общем учете
+        """
+        if self.board is not None:
+            self.board.publish(
+                self.reads.active
+                + self.reads.waiting
+                + self.writes.active
+                + self.writes.waiting
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика работы для мониторинга
+        """
+        return {"reads": self.reads.stats(), "writes": self.writes.stats()}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware контроля допуска запросов к API
+
+    Отклоненные запросы получают быстрый ответ 503 с заголовком Retry-After
+    вместо ожидания в очереди до таймаута прокси.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        path_prefix: str = "/api/",
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.controller = controller
+        self.path_prefix = path_prefix
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter_for(scope["method"])
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {"detail": "Сервер перегружен, повторите запрос позже"},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.controller.publish()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+            self.controller.publish()
+
+
+# Глобальный контроллер допуска запросов
+admission_controller = AdmissionController(
+    read_limit=settings.admission_read_limit,
+    write_limit=settings.admission_write_limit,
+    queue_size=settings.admission_queue_size,
+    queue_timeout=settings.admission_queue_timeout,
+    board=activity_board,
+)
@@ -0,0 +1,152 @@
+"""
+Объединение одинаковых конкурентных запросов (single-flight)
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.coherence import DataVersionWatcher, create_watcher
+from app.core.config import settings
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых конкурентных операций чтения
+
+    Конкурентные вызовы с одинаковым ключом разделяют одно выполнение:
+    первый вызов (лидер) выполняет операцию, остальные ожидают его результат.
+    Дополнительно результат может храниться ttl секунд (микро-кэш).
+
+    Ключи привязаны к поколению данных: invalidate() увеличивает поколение,
+    поэтому запросы, пришедшие после изменения данных, никогда не получат
+    результат, прочитанный до него.
+
+    При работе нескольких процессов изменения, сделанные другими процессами,
+    обнаруживаются наблюдателем watcher перед каждой операцией и также
+    увеличивают поколение.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 0.0,
+        max_entries: int = 1024,
+        watcher: Optional[DataVersionWatcher] = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.watcher = watcher
+        self.generation = 0
+        self._in_flight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._results: Dict[Tuple[int, Hashable], Tuple[float, Any]] = {}
+        # Счетчики для мониторинга
+        self.executions = 0
+        self.coalesced = 0
+        self.hits = 0
+
+    def invalidate(self) -> None:
+        """
+        Сброс всех результатов после изменения данных
+        """
+        self.generation += 1
+        self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика работы для мониторинга
+        """
+        return {
+            "generation": self.generation,
+            "in_flight": len(self._in_flight),
+            "cached": len(self._results),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "hits": self.hits,
+            "coherence": self.watcher.stats() if self.watcher is not None else None,
+        }
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполнение операции с объединением одинаковых конкурентных вызовов
+
+        Args:
+            key: Нормализованный ключ операции
+            fn: Операция, выполняемая лидером
+
+        Returns:
+            Результат операции
+        """
+        if self.watcher is not None and self.watcher.changed():
+            self.invalidate()
+
+        while True:
+            flight_key = (self.generation, key)
+
+            if self.ttl > 0:
+                cached = self._results.get(flight_key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self.hits += 1
+                    return cached[1]
+
+            future = self._in_flight.get(flight_key)
+            if future is None:
+                return await self._lead(flight_key, fn)
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Лидер был отменен (например, клиент отключился) -
+                # повторяем попытку, если отменили не нас самих
+                if not future.cancelled():
+                    raise
+
+    async def _lead(
+        self, flight_key: Tuple[int, Hashable], fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Выполнение операции лидером и передача результата ожидающим
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[flight_key] = future
+        self.executions += 1
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Исключение передано ожидающим, помечаем его как обработанное
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[flight_key]
+
+        future.set_result(value)
+        if self.ttl > 0 and flight_key[0] == self.generation:
+            self._store(flight_key, value)
+        return value
+
+    def _store(self, flight_key: Tuple[int, Hashable], value: Any) -> None:
+        """
+        Сохранение результата на время ttl
+        """
+        now = time.monotonic()
+        if len(self._results) >= self.max_entries:
+            self._results = {
+                cached_key: cached
+                for cached_key, cached in self._results.items()
+                if cached[0] > now
+            }
+            if len(self._results) >= self.max_entries:
+                self._results.clear()
+        self._results[flight_key] = (now + self.ttl, value)
+
+
+# Объединение запросов списка задач (GET /api/v1/tasks/)
+# Без ttl результаты не хранятся и отслеживать изменения других процессов не нужно
+task_list_flight = SingleFlight(
+    ttl=settings.list_cache_ttl,
+    watcher=create_watcher() if settings.list_cache_ttl > 0 else None,
+)
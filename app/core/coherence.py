@@ -0,0 +1,284 @@
+"""
+Согласованность кэшей между процессами (несколько воркеров на одном файле SQLite)
+"""
+
+import mmap
+import os
+import sqlite3
+import struct
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+
+def sqlite_path(database_url: str) -> Optional[str]:
+    """
+    Путь к файлу базы данных SQLite из URL подключения
+
+    Args:
+        database_url: URL подключения SQLAlchemy
+
+    Returns:
+        Путь к файлу или None для других СУБД и баз в памяти
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return None
+    if not url.database or url.database == ":memory:":
+        return None
+    return url.database
+
+
+class DataVersionWatcher:
+    """
+    Отслеживание изменений базы данных другими соединениями и процессами
+
+    Использует отдельное соединение SQLite и PRAGMA data_version: значение
+    меняется, если с момента прошлой проверки изменения зафиксировало любое
+    другое соединение, в том числе из другого процесса. Проверка не обращается
+    к диску, если файл не менялся, и занимает единицы микросекунд; при
+    poll_interval > 0 она выполняется не чаще одного раза за интервал.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._connection: Optional[sqlite3.Connection] = None
+        self._version: Optional[int] = None
+        self._next_poll = 0.0
+        # Счетчики для мониторинга
+        self.polls = 0
+        self.changes = 0
+
+    def changed(self) -> bool:
+        """
+        Проверка, изменилась ли база данных с момента прошлой проверки
+
+        Returns:
+            True, если другое соединение зафиксировало изменения
+        """
+        if self.poll_interval > 0:
+            now = time.monotonic()
+            if now < self._next_poll:
+                return False
+            self._next_poll = now + self.poll_interval
+
+        if self._connection is None:
+            # Соединение используется только из цикла событий, но тесты
+            # и разные циклы событий могут обращаться к нему из разных потоков
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+
+        self.polls += 1
+        version = self._connection.execute("PRAGMA data_version").fetchone()[0]
+        previous, self._version = self._version, version
+        if previous is None or previous == version:
+            return False
+        self.changes += 1
+        return True
+
+    def close(self) -> None:
+        """
+        Закрытие соединения
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._version = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика работы для мониторинга
+        """
+        return {
+            "data_version": self._version,
+            "polls": self.polls,
+            "changes": self.changes,
+        }
+
+
+def create_watcher() -> Optional[DataVersionWatcher]:
+    """
+    Создание наблюдателя для базы данных приложения
+
+    Returns:
+        Наблюдатель или None, если отслеживание отключено или недоступно
+    """
+    path = sqlite_path(settings.database_url)
+    if not settings.coherence_enabled or path is None:
+        return None
+    return DataVersionWatcher(path, poll_interval=settings.coherence_poll_interval)
+
+
+class LeaderLock:
+    """
+    Выбор одного процесса-лидера среди воркеров
+
+    Лидером становится процесс, первым захвативший эксклюзивную блокировку
+    файла (flock). Блокировка снимается операционной системой при завершении
+    процесса, поэтому после перезапуска воркеров ее захватит один из новых
+    процессов. Без файла блокировки (база в памяти) и на платформах без fcntl
+    лидером считается каждый процесс.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.held = False
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """
+        Попытка стать лидером без ожидания
+
+        Returns:
+            True, если процесс является лидером
+        """
+        if fcntl is None or self.path is None or self.held:
+            self.held = True
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        self.held = True
+        return True
+
+    def release(self) -> None:
+        """
+        Снятие блокировки
+        """
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self.held = False
+
+
+class ActivityBoard:
+    """
+    Общий для воркеров учет выполняющихся запросов
+
+    Файл, отображенный в память всеми воркерами, разбит на слоты: каждый воркер
+    занимает свой слот (PID и количество выполняющихся запросов) и обновляет его
+    при начале и завершении запроса - это запись нескольких байт в память без
+    системных вызовов. Чтение всех слотов позволяет процессу-лидеру определить
+    период простоя всего приложения, а не только своего процесса. Слоты
+    завершившихся процессов освобождаются при следующем занятии слота.
+    """
+
+    _SLOT = struct.Struct("qq")
+    _IN_FLIGHT = struct.Struct("q")
+
+    def __init__(self, path: str, slots: int = 256):
+        self.path = path
+        self.slots = slots
+        self._mmap: Optional[mmap.mmap] = None
+        self._offset: Optional[int] = None
+
+    def open(self) -> None:
+        """
+        Отображение файла в память и занятие слота текущим процессом
+        """
+        if self._mmap is not None:
+            return
+        size = self._SLOT.size * self.slots
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Слоты занимаются под блокировкой файла, чтобы два воркера
+            # не заняли один слот одновременно
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+            pid = os.getpid()
+            for offset in range(0, size, self._SLOT.size):
+                slot_pid, _ = self._SLOT.unpack_from(self._mmap, offset)
+                if slot_pid in (0, pid) or not _process_alive(slot_pid):
+                    self._SLOT.pack_into(self._mmap, offset, pid, 0)
+                    self._offset = offset
+                    break
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def publish(self, in_flight: int) -> None:
+        """
+        Публикация количества выполняющихся запросов текущего процесса
+
+        Args:
+            in_flight: Количество выполняющихся и ожидающих запросов
+        """
+        if self._offset is not None:
+            self._IN_FLIGHT.pack_into(self._mmap, self._offset + 8, in_flight)
+
+    def busy_workers(self) -> int:
+        """
+        Количество воркеров, выполняющих запросы
+
+        Returns:
+            Количество живых процессов с ненулевым числом запросов
+        """
+        if self._mmap is None:
+            return 0
+        busy = 0
+        for pid, in_flight in self._SLOT.iter_unpack(self._mmap):
+            if pid and in_flight and _process_alive(pid):
+                busy += 1
+        return busy
+
+    def is_idle(self) -> bool:
+        """
+        Проверка отсутствия запросов во всех воркерах
+        """
+        return self.busy_workers() == 0
+
+    def close(self) -> None:
+        """
+        Освобождение слота и файла
+        """
+        if self._mmap is not None:
+            if self._offset is not None:
+                self._SLOT.pack_into(self._mmap, self._offset, 0, 0)
+            self._mmap.close()
+            self._mmap = None
+            self._offset = None
+
+
+def _process_alive(pid: int) -> bool:
+    """
+    Проверка существования процесса
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def create_activity_board() -> Optional[ActivityBoard]:
+    """
+    Создание общего учета запросов для базы данных приложения
+
+    Returns:
+        Учет запросов или None для баз в памяти и платформ без fcntl
+    """
+    path = sqlite_path(settings.database_url)
+    if fcntl is None or path is None:
+        return None
+    return ActivityBoard(f"{path}.activity")
+
+
+# Общий для воркеров учет выполняющихся запросов
+activity_board = create_activity_board()
@@ -0,0 +1,269 @@
+"""
+Сжатие ответов с согласованием кодировки (gzip, brotli, zstd)
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli является необязательной зависимостью
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard является необязательной зависимостью
+    zstandard = None
+
+
+class Compressor(ABC):
+    """
+    Потоковый компрессор для одной кодировки
+    """
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """
+        Сжатие очередной части ответа с немедленной выдачей результата
+        """
+
+    @abstractmethod
+    def finish(self, data: bytes = b"") -> bytes:
+        """
+        Сжатие последней части ответа и завершение потока
+        """
+
+
+class GzipCompressor(Compressor):
+    """
+    Компрессор gzip на базе zlib
+    """
+
+    def __init__(self, level: int):
+        # wbits=31 - формат gzip с заголовком и контрольной суммой
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(Compressor):
+    """
+    Компрессор brotli
+    """
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdCompressor(Compressor):
+    """
+    Компрессор zstd
+    """
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+def available_encodings(
+    gzip_level: int, brotli_level: int, zstd_level: int
+) -> Dict[str, Callable[[], Compressor]]:
+    """
+    Доступные кодировки в порядке предпочтения сервера
+
+    Args:
+        gzip_level: Уровень сжатия gzip (1-9)
+        brotli_level: Уровень сжатия brotli (0-11)
+        zstd_level: Уровень сжатия zstd (1-22)
+
+    Returns:
+        Фабрики компрессоров по названию кодировки
+    """
+    encodings: Dict[str, Callable[[], Compressor]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = lambda: ZstdCompressor(zstd_level)
+    if brotli is not None:
+        encodings["br"] = lambda: BrotliCompressor(brotli_level)
+    encodings["gzip"] = lambda: GzipCompressor(gzip_level)
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """
+    Выбор кодировки по заголовку Accept-Encoding
+
+    Выбирается кодировка с наибольшим весом q, при равных весах -
+    первая в порядке предпочтения сервера.
+
+    Args:
+        accept_encoding: Значение заголовка Accept-Encoding
+        supported: Поддерживаемые кодировки в порядке предпочтения
+
+    Returns:
+        Название кодировки или None, если сжатие не требуется
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов
+
+    Сжимаются только ответы не меньше minimum_size байт без собственной
+    кодировки. Потоковые ответы сжимаются по частям: каждая часть
+    отправляется клиенту сразу, без накопления всего ответа в памяти.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 3,
+        brotli_level: int = 1,
+        zstd_level: int = 1,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings(gzip_level, brotli_level, zstd_level)
+        self.supported = list(self.encodings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            encoding = negotiate_encoding(accept_encoding, self.supported)
+            if encoding is not None:
+                responder = CompressionResponder(
+                    self.app, encoding, self.encodings[encoding], self.minimum_size
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class CompressionResponder:
+    """
+    Сжатие одного ответа выбранной кодировкой
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoding: str,
+        compressor_factory: Callable[[], Compressor],
+        minimum_size: int,
+    ):
+        self.app = app
+        self.encoding = encoding
+        self.compressor_factory = compressor_factory
+        self.minimum_size = minimum_size
+        self.send: Optional[Send] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        """
+        Перехват сообщений ответа и сжатие его тела
+
+        Заголовки задерживаются до первой части тела: короткий ответ без
+        продолжения и ответ с собственной кодировкой отправляются как есть,
+        иначе добавляется Content-Encoding и каждая часть сжимается сразу.
+
+        Args:
+            message: ASGI сообщение ответа приложения
+        """
+        assert self.send is not None
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Заголовки отправляются после первой части тела,
+            # когда становится известно, нужно ли сжатие
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.compressor = self.compressor_factory()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                message["body"] = self.compressor.compress(body)
+            else:
+                message["body"] = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(message["body"]))
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if self.passthrough or self.compressor is None:
+            await self.send(message)
+            return
+
+        if more_body:
+            message["body"] = self.compressor.compress(body)
+        else:
+            message["body"] = self.compressor.finish(body)
+        await self.send(message)
@@ -2,6 +2,8 @@
 Конфигурация приложения
 """
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +18,82 @@ class Settings(BaseSettings):
     # Настройки базы данных
     database_url: str = "sqlite+aiosqlite:///./tasks.db"
 
+    # Настройки очереди задач (аренда задач воркерами)
+    lease_default_seconds: int = 30
+    lease_max_seconds: int = 3600
+    claim_max_batch: int = 100
+
+    # Объединение одинаковых конкурентных запросов списка задач
+    list_coalescing_enabled: bool = True
+    # Время жизни результата в секундах (0 - только объединение запросов)
+    list_cache_ttl: float = 0.0
+
+    # Контроль допуска запросов (отдельно для чтения и записи)
+    admission_enabled: bool = True
+    admission_read_limit: int = 64
+    admission_write_limit: int = 8
+    admission_queue_size: int = 256
+    # Максимальное время ожидания в очереди в секундах
+    admission_queue_timeout: float = 5.0
+    admission_retry_after: int = 1
+
+    # Режим журнала SQLite (WAL позволяет читать во время записи)
+    sqlite_journal_mode: str = "WAL"
+    # Размер, до которого обрезается файл WAL после контрольной точки, в байтах
+    sqlite_journal_size_limit: int = 64 * 1024 * 1024
+
+    # Фоновое обслуживание базы данных
+    maintenance_enabled: bool = True
+    # Интервал между запусками обслуживания в секундах
+    maintenance_interval: float = 3600.0
+    # Интервал между проверками целостности в секундах
+    maintenance_integrity_interval: float = 86400.0
+    # Количество страниц, освобождаемых за один шаг очистки
+    maintenance_vacuum_step_pages: int = 256
+    # Пауза между шагами в секундах
+    maintenance_step_pause: float = 0.05
+    # Максимальная длительность одного задания в секундах
+    maintenance_job_budget: float = 5.0
+    # Максимальное время ожидания периода простоя в секундах
+    maintenance_idle_wait: float = 10.0
+    # Интервал попыток стать воркером, выполняющим обслуживание, в секундах
+    maintenance_leader_retry: float = 30.0
+    # Задержка первого запуска обслуживания после старта в секундах
+    maintenance_initial_delay: float = 60.0
+    # Количество строк индекса, просматриваемых ANALYZE (0 - без ограничения)
+    maintenance_analysis_limit: int = 1000
+
+    # Профилирование запросов по заголовку X-Profile
+    profiling_enabled: bool = False
+    # Значение заголовка X-Profile, необходимое для профилирования (если задано)
+    profiling_token: Optional[str] = None
+    # Количество хранимых отчетов профилирования
+    profiling_store_size: int = 50
+
+    # Сжатие ответов (gzip, а также brotli и zstd при наличии библиотек)
+    compression_enabled: bool = True
+    # Минимальный размер ответа для сжатия в байтах
+    compression_minimum_size: int = 1024
+    # Уровни выбраны по benchmarks/bench_compression.py: выше них затраты
+    # CPU растут заметно быстрее, чем уменьшается размер ответа
+    compression_gzip_level: int = 3
+    compression_brotli_level: int = 1
+    compression_zstd_level: int = 1
+
+    # Настройки запуска нескольких воркеров (python -m app.serve)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    # Количество воркеров (0 - по числу ядер процессора)
+    workers: int = 1
+    # Отслеживание изменений базы данных другими процессами (PRAGMA data_version)
+    coherence_enabled: bool = True
+    # Минимальный интервал между проверками в секундах (0 - перед каждым чтением)
+    coherence_poll_interval: float = 0.0
+
+    # Настройки прогрева при запуске
+    warmup_enabled: bool = True
+    warmup_connections: int = 5
+
     # Настройки для тестирования
     test_database_url: str = "sqlite+aiosqlite:///./test_tasks.db"
 
@@ -4,6 +4,7 @@
 
 from typing import AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -17,6 +18,25 @@ class Base(DeclarativeBase):
 # Создание движка базы данных
 engine = create_async_engine(settings.database_url, echo=settings.debug, future=True)
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, _connection_record):
+    """
+    Настройка соединения SQLite при его открытии
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    # Применяется только к новой базе данных (до создания первой таблицы)
+    # и позволяет возвращать свободные страницы через incremental_vacuum
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA journal_size_limit = {settings.sqlite_journal_size_limit}")
+    # Каскадное удаление связей задач с тегами
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.close()
+
+
 # Создание фабрики сессий
 AsyncSessionLocal = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -0,0 +1,359 @@
+"""
+Фоновое обслуживание базы данных SQLite
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.admission import admission_controller
+from app.core.coherence import LeaderLock, activity_board, sqlite_path
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Количество инструкций виртуальной машины SQLite между проверками бюджета времени
+_PROGRESS_HANDLER_STEPS = 1000
+
+# Во сколько раз должно измениться количество строк, чтобы статистика устарела
+STALE_STATS_FACTOR = 2
+
+
+class MaintenanceScheduler:
+    """
+    Планировщик обслуживания базы данных
+
+    Периодически выполняет контрольную точку WAL, инкрементальную очистку
+    свободных страниц, обновление статистики планировщика (PRAGMA optimize)
+    и проверку целостности. Каждое задание выполняется короткими шагами
+    в периоды простоя, чтобы не блокировать обработку запросов, а результат
+    сохраняется в отчете.
+
+    Если передана блокировка leader, задания выполняет только процесс,
+    удерживающий ее; остальные процессы повторяют попытку захвата каждые
+    leader_retry секунд и подхватывают обслуживание после завершения лидера.
+    """
+
+    def __init__(
+        self,
+        db_engine: AsyncEngine,
+        interval: float,
+        integrity_interval: float,
+        vacuum_step_pages: int,
+        step_pause: float,
+        job_budget: float,
+        idle_wait: float,
+        is_idle: Callable[[], bool] = lambda: True,
+        leader: Optional[LeaderLock] = None,
+        leader_retry: float = 30.0,
+        initial_delay: float = 60.0,
+        analysis_limit: int = 1000,
+    ):
+        self.engine = db_engine
+        self.interval = interval
+        self.integrity_interval = integrity_interval
+        self.vacuum_step_pages = vacuum_step_pages
+        self.step_pause = step_pause
+        self.job_budget = job_budget
+        self.idle_wait = idle_wait
+        self.is_idle = is_idle
+        self.leader = leader
+        self.leader_retry = leader_retry
+        self.initial_delay = initial_delay
+        self.analysis_limit = analysis_limit
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self._last_integrity_check: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        Запуск планировщика в фоновой задаче
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Остановка планировщика
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader is not None:
+            self.leader.release()
+
+    async def _loop(self) -> None:
+        """
+        Основной цикл планировщика
+        """
+        # Первый запуск вскоре после старта: при частых перезапусках воркеров
+        # ожидание полного интервала не дало бы обслуживанию выполниться никогда
+        delay = self.initial_delay
+        while True:
+            if self.leader is not None and not self.leader.acquire():
+                await asyncio.sleep(self.leader_retry)
+                continue
+            await asyncio.sleep(delay)
+            delay = self.interval
+            await self.run_once()
+
+    async def run_once(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Однократное выполнение всех заданий обслуживания
+
+        Returns:
+            Отчеты о выполненных заданиях
+        """
+        jobs = [
+            ("wal_checkpoint", self.wal_checkpoint),
+            ("incremental_vacuum", self.incremental_vacuum),
+            ("optimize", self.optimize),
+        ]
+        now = time.monotonic()
+        if (
+            self._last_integrity_check is None
+            or now - self._last_integrity_check >= self.integrity_interval
+        ):
+            self._last_integrity_check = now
+            jobs.append(("integrity_check", self.integrity_check))
+
+        for name, job in jobs:
+            await self._run_job(name, job)
+        if self.reports.get("integrity_check", {}).get("timed_out"):
+            self._last_integrity_check = None
+        return self.reports
+
+    async def _run_job(self, name: str, job: Callable[[AsyncConnection], Any]) -> None:
+        """
+        Выполнение задания с формированием отчета
+        """
+        idle = await self._wait_for_idle()
+        started = time.perf_counter()
+        report: Dict[str, Any] = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            # False - простоя не было за idle_wait, задание выполнено под нагрузкой
+            "idle_window": idle,
+        }
+        try:
+            async with self.engine.connect() as conn:
+                report.update(await job(conn))
+            report["status"] = "timeout" if report.get("timed_out") else "ok"
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            report["status"] = "error"
+            report["error"] = str(exc)
+            logger.exception("Ошибка обслуживания базы данных: %s", name)
+        report["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self.reports[name] = report
+        logger.info("Обслуживание базы данных %s: %s", name, report)
+
+    async def _wait_for_idle(self) -> bool:
+        """
+        Ожидание периода простоя (не дольше idle_wait секунд)
+
+        Returns:
+            True, если период простоя наступил, False - если время ожидания истекло
+        """
+        deadline = time.monotonic() + self.idle_wait
+        while not self.is_idle():
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(self.step_pause)
+        return True
+
+    async def wal_checkpoint(self, conn: AsyncConnection) -> Dict[str, Any]:
+        """
+        Контрольная точка WAL
+
+        В период простоя выполняется в режиме TRUNCATE, который переносит WAL
+        в основной файл и обрезает файл -wal до нулевого размера. Под нагрузкой
+        выполняется в режиме PASSIVE, не блокирующем читателей и писателей.
+        """
+        mode = "TRUNCATE" if self.is_idle() else "PASSIVE"
+        result = await conn.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})")
+        busy, log_frames, checkpointed = result.one()
+        return {
+            "mode": mode,
+            "busy": bool(busy),
+            "log_frames": log_frames,
+            "checkpointed_frames": checkpointed,
+        }
+
+    async def incremental_vacuum(self, conn: AsyncConnection) -> Dict[str, Any]:
+        """
+        Возврат свободных страниц файловой системе небольшими шагами
+        """
+        auto_vacuum = (await conn.exec_driver_sql("PRAGMA auto_vacuum")).scalar()
+        free_pages = (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+        report = {"free_pages_before": free_pages, "steps": 0, "steps_under_load": 0}
+        # Инкрементальная очистка доступна только при auto_vacuum=INCREMENTAL (2)
+        if auto_vacuum != 2:
+            report["skipped"] = "auto_vacuum не равен INCREMENTAL"
+            return report
+
+        deadline = time.monotonic() + self.job_budget
+        while free_pages and time.monotonic() < deadline:
+            # Каждый шаг выполнения прагмы освобождает одну страницу, поэтому
+            # она выполняется через executescript, который доводит ее до конца
+            raw_connection = await conn.get_raw_connection()
+            await raw_connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(self.vacuum_step_pages)})"
+            )
+            report["steps"] += 1
+            free_pages = (await conn.exec_driver_sql("PRAGMA freelist_count")).scalar()
+            if free_pages:
+                await asyncio.sleep(self.step_pause)
+                if not await self._wait_for_idle():
+                    report["steps_under_load"] += 1
+
+        report["free_pages_after"] = free_pages
+        return report
+
+    async def optimize(self, conn: AsyncConnection) -> Dict[str, Any]:
+        """
+        Обновление статистики планировщика запросов
+
+        До SQLite 3.46 PRAGMA optimize анализирует только таблицы, к которым
+        обращалось текущее соединение, поэтому на отдельном соединении
+        обслуживания ничего не делает. В этом случае ANALYZE выполняется явно
+        для таблиц без статистики или с устаревшей статистикой (количество строк
+        изменилось более чем в STALE_STATS_FACTOR раз), с ограничением числа
+        просматриваемых строк (PRAGMA analysis_limit) и бюджетом job_budget.
+        """
+        if sqlite3.sqlite_version_info >= (3, 46, 0):
+            # 0x10000 - проверка всех таблиц, 0x00002 - ANALYZE при необходимости,
+            # 0x00001 - отладочный режим: только список запланированных команд
+            result = await conn.exec_driver_sql("PRAGMA optimize(0x10003)")
+            statements = [row[0] for row in result]
+            await conn.exec_driver_sql("PRAGMA optimize(0x10002)")
+            return {"method": "optimize", "analyzed": statements}
+
+        deadline = time.monotonic() + self.job_budget
+        report: Dict[str, Any] = {"method": "analyze", "analyzed": []}
+        await conn.exec_driver_sql(
+            f"PRAGMA analysis_limit = {int(self.analysis_limit)}"
+        )
+        try:
+            for table in await self._stale_tables(conn):
+                if time.monotonic() >= deadline:
+                    report["timed_out"] = True
+                    break
+                await conn.exec_driver_sql(f'ANALYZE "{table}"')
+                report["analyzed"].append(table)
+            await conn.commit()
+        finally:
+            await conn.exec_driver_sql("PRAGMA analysis_limit = 0")
+        return report
+
+    async def _stale_tables(self, conn: AsyncConnection) -> List[str]:
+        """
+        Таблицы без статистики планировщика или с устаревшей статистикой
+        """
+        result = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+        tables = [row[0] for row in result]
+        result = await conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )
+        if result.scalar() is None:
+            return tables
+
+        result = await conn.exec_driver_sql("SELECT tbl, stat FROM sqlite_stat1")
+        analyzed_rows: Dict[str, int] = {}
+        for table, stat in result:
+            # Первое число статистики - количество строк на момент ANALYZE
+            analyzed_rows[table] = int(stat.split()[0]) if stat else 0
+
+        stale = []
+        for table in tables:
+            if table not in analyzed_rows:
+                stale.append(table)
+                continue
+            rows = (
+                await conn.exec_driver_sql(f'SELECT COUNT(*) FROM "{table}"')
+            ).scalar()
+            rows = max(rows, 1)
+            before = max(analyzed_rows[table], 1)
+            if max(rows, before) / min(rows, before) >= STALE_STATS_FACTOR:
+                stale.append(table)
+        return stale
+
+    async def integrity_check(self, conn: AsyncConnection) -> Dict[str, Any]:
+        """
+        Быстрая проверка целостности базы данных
+
+        Проверка выполняется одной командой, поэтому бюджет job_budget соблюдается
+        прерыванием через обработчик прогресса SQLite. Прерванная проверка
+        отмечается в отчете и повторяется при следующем запуске обслуживания.
+        """
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        deadline = time.monotonic() + self.job_budget
+        await driver_connection.set_progress_handler(
+            lambda: time.monotonic() > deadline, _PROGRESS_HANDLER_STEPS
+        )
+        try:
+            result = await conn.exec_driver_sql("PRAGMA quick_check")
+            messages = [row[0] for row in result]
+        except OperationalError as exc:
+            if "interrupted" not in str(exc.orig):
+                raise
+            return {"ok": None, "timed_out": True}
+        finally:
+            await driver_connection.set_progress_handler(None, 0)
+        return {"ok": messages == ["ok"], "messages": messages[:10]}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Отчеты о последнем выполнении заданий для мониторинга
+        """
+        return {
+            "running": self._task is not None,
+            "leader": self.leader is None or self.leader.held,
+            "jobs": self.reports,
+        }
+
+
+def _application_is_idle() -> bool:
+    """
+    Проверка отсутствия запросов в текущем процессе и во всех воркерах
+    """
+    if not admission_controller.is_idle():
+        return False
+    return activity_board is None or activity_board.is_idle()
+
+
+# Обслуживание выполняет только один из воркеров, работающих с файлом базы данных
+_database_path = sqlite_path(settings.database_url)
+maintenance_leader = LeaderLock(
+    f"{_database_path}.maintenance.lock" if _database_path else None
+)
+
+# Глобальный планировщик обслуживания базы данных
+maintenance_scheduler = MaintenanceScheduler(
+    engine,
+    interval=settings.maintenance_interval,
+    integrity_interval=settings.maintenance_integrity_interval,
+    vacuum_step_pages=settings.maintenance_vacuum_step_pages,
+    step_pause=settings.maintenance_step_pause,
+    job_budget=settings.maintenance_job_budget,
+    idle_wait=settings.maintenance_idle_wait,
+    is_idle=_application_is_idle,
+    leader=maintenance_leader,
+    leader_retry=settings.maintenance_leader_retry,
+    initial_delay=settings.maintenance_initial_delay,
+    analysis_limit=settings.maintenance_analysis_limit,
+)
@@ -0,0 +1,141 @@
+"""
+Версионирование схемы базы данных
+"""
+
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# Схема версии 1. Миграции фиксируют схему своей версии явным DDL и не зависят
+# от текущих моделей: изменения моделей оформляются новыми миграциями
+_SCHEMA_V1 = [
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER NOT NULL,
+        title VARCHAR(200) NOT NULL,
+        description TEXT,
+        completed BOOLEAN NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        lease_owner VARCHAR(100),
+        lease_expires_at DATETIME,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks (id)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title ON tasks (title)",
+    """
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER NOT NULL,
+        name VARCHAR(50) NOT NULL,
+        created_at DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_tags (
+        task_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (task_id, tag_id),
+        FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE,
+        FOREIGN KEY (tag_id) REFERENCES tags (id) ON DELETE CASCADE
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_task_tags_tag_id_task_id "
+    "ON task_tags (tag_id, task_id)",
+]
+
+
+def _initial_schema(conn: Connection) -> None:
+    """
+    Схема на момент введения версионирования
+
+    Базы данных, созданные до версионирования через create_all, могут не иметь
+    таблиц тегов и колонок аренды - они создаются здесь.
+    """
+    for statement in _SCHEMA_V1:
+        conn.exec_driver_sql(statement)
+
+    columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(tasks)")}
+    if "lease_owner" not in columns:
+        conn.exec_driver_sql("ALTER TABLE tasks ADD COLUMN lease_owner VARCHAR(100)")
+    if "lease_expires_at" not in columns:
+        conn.exec_driver_sql("ALTER TABLE tasks ADD COLUMN lease_expires_at DATETIME")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_lease_state "
+        "ON tasks (completed, lease_expires_at)"
+    )
+
+
+# Миграции в порядке применения: (версия, описание, функция)
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Начальная схема: задачи, аренда, теги", _initial_schema),
+]
+
+# Актуальная версия схемы
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+async def get_schema_version(conn: AsyncConnection) -> int:
+    """
+    Получение текущей версии схемы (0 - схема не версионирована)
+
+    Args:
+        conn: Соединение с базой данных
+
+    Returns:
+        Версия схемы
+    """
+    exists = await conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    )
+    if exists.scalar() is None:
+        return 0
+    result = await conn.exec_driver_sql("SELECT MAX(version) FROM schema_version")
+    return result.scalar() or 0
+
+
+async def ensure_schema(db_engine: AsyncEngine) -> List[int]:
+    """
+    Проверка версии схемы и применение недостающих миграций
+
+    Если схема актуальна, выполняется только дешевая проверка версии.
+    Иначе миграции применяются под блокировкой записи (BEGIN IMMEDIATE):
+    при одновременном запуске нескольких процессов миграции применит
+    только первый из них, остальные увидят актуальную версию.
+
+    Args:
+        db_engine: Движок базы данных
+
+    Returns:
+        Версии примененных миграций
+    """
+    async with db_engine.connect() as conn:
+        if await get_schema_version(conn) >= SCHEMA_VERSION:
+            return []
+
+        await conn.exec_driver_sql("BEGIN IMMEDIATE")
+        # Повторная проверка под блокировкой: миграции мог применить другой процесс
+        version = await get_schema_version(conn)
+        await conn.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            "version INTEGER PRIMARY KEY, "
+            "description TEXT NOT NULL, "
+            "applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+
+        applied = []
+        for migration_version, description, migrate in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            await conn.run_sync(migrate)
+            await conn.exec_driver_sql(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (migration_version, description),
+            )
+            applied.append(migration_version)
+
+        await conn.commit()
+        return applied
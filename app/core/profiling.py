@@ -0,0 +1,255 @@
+"""
+Профилирование отдельных запросов по требованию
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Накопленное время запросов к базе данных для профилируемого запроса
+_db_time: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "profiling_db_time", default=None
+)
+
+# Признаки функций, относящихся к валидации и сериализации
+VALIDATION_MARKERS = ("SchemaValidator", "/pydantic/")
+SERIALIZATION_MARKERS = (
+    "SchemaSerializer",
+    "/fastapi/encoders.py",
+    "/json/",
+    "/starlette/responses.py",
+    "msgpack",
+)
+
+
+class ProfileStore:
+    """
+    Хранилище последних отчетов профилирования
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._reports: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+
+    def add(self, report: str, raw_stats: bytes) -> str:
+        """
+        Сохранение отчета
+
+        Args:
+            report: Текстовый отчет (дерево вызовов)
+            raw_stats: Статистика в формате pstats
+
+        Returns:
+            Идентификатор отчета
+        """
+        profile_id = uuid.uuid4().hex
+        self._reports[profile_id] = (report, raw_stats)
+        while len(self._reports) > self.max_entries:
+            self._reports.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Получение отчета по идентификатору
+        """
+        return self._reports.get(profile_id)
+
+
+def is_profiling() -> bool:
+    """
+    Профилируется ли текущий запрос
+
+    Профилируемые запросы не должны разделять результат с другими запросами
+    (например, через объединение запросов), иначе отчет не отражает их работу.
+    """
+    return _db_time.get() is not None
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    """
+    Засечка времени начала запроса к базе данных
+    """
+    if _db_time.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, _statement, _parameters, _context, _many):
+    """
+    Учет длительности запроса к базе данных
+    """
+    timings = _db_time.get()
+    if timings is not None and conn.info.get("profiling_started"):
+        started = conn.info["profiling_started"].pop()
+        timings["db"] += time.perf_counter() - started
+        timings["queries"] += 1
+
+
+def install_db_timing(sync_engine: Engine) -> None:
+    """
+    Подключение учета времени запросов к базе данных
+    """
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _ProfiledCoroutine:
+    """
+    Обертка корутины, включающая профилировщик только на время ее выполнения
+
+    Событийный цикл возобновляет корутину запроса через send()/throw(),
+    поэтому профилировщик не учитывает код других конкурентных запросов.
+    """
+
+    def __init__(self, coro, profiler: cProfile.Profile):
+        self.coro = coro
+        self.profiler = profiler
+        self.active = True
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def send(self, value):
+        return self._step(self.coro.send, value)
+
+    def throw(self, *args):
+        return self._step(self.coro.throw, *args)
+
+    def close(self):
+        return self.coro.close()
+
+    def _step(self, method, *args):
+        if not self.active:
+            return method(*args)
+        self.profiler.enable()
+        try:
+            return method(*args)
+        finally:
+            self.profiler.disable()
+
+
+def _categorize(stats: pstats.Stats) -> Dict[str, float]:
+    """
+    Распределение собственного времени функций по категориям
+    """
+    totals = {"validation": 0.0, "serialization": 0.0}
+    for (filename, _line, name), (
+        _cc,
+        _nc,
+        tottime,
+        _ct,
+        _callers,
+    ) in stats.stats.items():  # type: ignore[attr-defined]
+        location = f"{filename}:{name}"
+        if any(marker in location for marker in SERIALIZATION_MARKERS):
+            totals["serialization"] += tottime
+        elif any(marker in location for marker in VALIDATION_MARKERS):
+            totals["validation"] += tottime
+    return totals
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware профилирования запросов, помеченных заголовком
+
+    Запрос профилируется, если передан заголовок X-Profile (со значением
+    токена, если он задан в настройках). В ответ добавляются заголовки
+    Server-Timing с разбивкой времени и X-Profile-Id с идентификатором
+    сохраненного отчета. Middleware подключается только при включенном
+    профилировании, поэтому в обычном режиме накладных расходов нет.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        token: Optional[str] = None,
+        report_limit: int = 40,
+    ):
+        self.app = app
+        self.store = store
+        self.token = token
+        self.report_limit = report_limit
+
+    def _should_profile(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return not self.token or value.decode("latin-1") == self.token
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        timings = {"db": 0.0, "queries": 0}
+        token = _db_time.set(timings)
+        started = time.perf_counter()
+        coro: Optional[_ProfiledCoroutine] = None
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and coro is not None:
+                # Профиль охватывает обработку запроса до начала отправки ответа
+                coro.active = False
+                headers = MutableHeaders(scope=message)
+                for name, value in self._finish(profiler, timings, started).items():
+                    headers.append(name, value)
+            await send(message)
+
+        coro = _ProfiledCoroutine(self.app(scope, receive, send_with_timing), profiler)
+        try:
+            await coro
+        finally:
+            _db_time.reset(token)
+
+    def _finish(
+        self, profiler: cProfile.Profile, timings: Dict[str, Any], started: float
+    ) -> Dict[str, str]:
+        """
+        Формирование отчета и заголовков ответа
+        """
+        total = time.perf_counter() - started
+        stats = pstats.Stats(profiler)
+        categories = _categorize(stats)
+
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(
+            self.report_limit
+        )
+        profile_id = self.store.add(
+            report.getvalue(),
+            marshal.dumps(stats.stats),  # type: ignore[attr-defined]
+        )
+
+        server_timing = ", ".join(
+            [
+                f'db;dur={timings["db"] * 1000:.3f};desc="{timings["queries"]} queries"',
+                f'validation;dur={categories["validation"] * 1000:.3f}',
+                f'serialization;dur={categories["serialization"] * 1000:.3f}',
+                f"total;dur={total * 1000:.3f}",
+            ]
+        )
+        return {"Server-Timing": server_timing, "X-Profile-Id": profile_id}
+
+
+# Глобальное хранилище отчетов профилирования
+profile_store = ProfileStore(max_entries=settings.profiling_store_size)
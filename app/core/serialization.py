@@ -0,0 +1,219 @@
+"""
+Согласование формата данных: JSON и MessagePack
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Coroutine
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Допустимые обозначения MessagePack в заголовках Accept и Content-Type
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+
+# Начало эпохи Unix для кодирования дат в timestamp
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _encode_default(value: Any) -> Any:
+    """
+    Преобразование типов, не поддерживаемых MessagePack напрямую
+    """
+    if isinstance(value, datetime):
+        # Даты хранятся в базе данных в UTC без часового пояса;
+        # Timestamp собирается напрямую - это заметно быстрее from_datetime()
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        return msgpack.Timestamp(
+            delta.days * 86400 + delta.seconds, delta.microseconds * 1000
+        )
+    raise TypeError(f"Неподдерживаемый тип для MessagePack: {type(value).__name__}")
+
+
+def packb(data: Any) -> bytes:
+    """
+    Кодирование данных в MessagePack (даты - в виде нативных timestamp)
+    """
+    return msgpack.packb(data, default=_encode_default)
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Декодирование данных из MessagePack (timestamp - в datetime с UTC)
+    """
+    return msgpack.unpackb(data, timestamp=3)
+
+
+def _reject_binary(value: Any) -> None:
+    """
+    Проверка отсутствия бинарных значений (типы bin и ext) в теле запроса
+
+    Схемы API не содержат бинарных полей, а bytes или ExtType на месте
+    строки приводят к ошибке при формировании ответа об ошибке валидации.
+
+    Raises:
+        ValueError: Если тело содержит бинарное значение
+    """
+    if isinstance(value, (bytes, msgpack.ExtType)):
+        raise ValueError("Бинарные значения MessagePack не поддерживаются")
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _reject_binary(key)
+            _reject_binary(item)
+    elif isinstance(value, list):
+        for item in value:
+            _reject_binary(item)
+
+
+def _media_type(value: str) -> str:
+    """
+    Тип содержимого без параметров
+    """
+    return value.split(";", 1)[0].strip().lower()
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    Выбор формата ответа по заголовку Accept
+
+    MessagePack выбирается, только если клиент явно предпочитает его JSON,
+    поэтому существующие JSON клиенты не затрагиваются.
+
+    Args:
+        accept: Значение заголовка Accept
+
+    Returns:
+        Тип содержимого ответа
+    """
+    msgpack_weight = 0.0
+    json_weight = 0.0
+    for item in accept.split(","):
+        media_type, _, params = item.partition(";")
+        media_type = media_type.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_weight = max(msgpack_weight, weight)
+        elif media_type == JSON_MEDIA_TYPE:
+            json_weight = max(json_weight, weight)
+    return MSGPACK_MEDIA_TYPE if msgpack_weight > json_weight else JSON_MEDIA_TYPE
+
+
+def response_media_type(request: Request) -> str:
+    """
+    Формат ответа для запроса
+    """
+    return negotiate_media_type(request.headers.get("accept", ""))
+
+
+def encode(content: BaseModel, media_type: str) -> bytes:
+    """
+    Сериализация модели в выбранный формат
+
+    Args:
+        content: Pydantic модель ответа
+        media_type: Тип содержимого ответа
+
+    Returns:
+        Сериализованное тело ответа
+    """
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return packb(content.model_dump())
+    return content.model_dump_json().encode()
+
+
+def negotiated_response(
+    body: bytes, media_type: str, status_code: int = 200
+) -> Response:
+    """
+    Ответ, формат которого выбран по заголовку Accept
+
+    Заголовок Vary: Accept не позволяет общим кэшам и CDN отдать
+    клиенту JSON ответ, сохраненный для клиента MessagePack, и наоборот.
+
+    Args:
+        body: Сериализованное тело ответа
+        media_type: Тип содержимого ответа
+        status_code: HTTP статус ответа
+
+    Returns:
+        Ответ с заголовком Vary: Accept
+    """
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
+
+
+def render(request: Request, content: BaseModel, status_code: int = 200) -> Response:
+    """
+    Формирование ответа в формате, согласованном с клиентом
+
+    Args:
+        request: Запрос клиента
+        content: Pydantic модель ответа
+        status_code: HTTP статус ответа
+
+    Returns:
+        Ответ в формате JSON или MessagePack
+    """
+    media_type = response_media_type(request)
+    return negotiated_response(encode(content, media_type), media_type, status_code)
+
+
+class MsgPackRequest(Request):
+    """
+    Запрос с телом в формате MessagePack
+    """
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            data = unpackb(body)
+            _reject_binary(data)
+            self._json = data
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    """
+    Маршрут, принимающий тело запроса в формате JSON или MessagePack
+
+    FastAPI разбирает в модели только JSON тела, поэтому для MessagePack
+    тип содержимого подменяется на JSON, а декодирование выполняет
+    MsgPackRequest. Ошибки декодирования и бинарные значения (типы bin
+    и ext) приводят к ответу 400.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type", "")
+            if _media_type(content_type) in MSGPACK_MEDIA_TYPES:
+                scope = dict(request.scope)
+                scope["headers"] = [
+                    (
+                        name,
+                        JSON_MEDIA_TYPE.encode() if name == b"content-type" else value,
+                    )
+                    for name, value in request.scope["headers"]
+                ]
+                request = MsgPackRequest(scope, request.receive)
+            return await original_route_handler(request)
+
+        return route_handler
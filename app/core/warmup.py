@@ -0,0 +1,172 @@
+"""
+Прогрев приложения при запуске и измерение времени старта
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.migrations import SCHEMA_VERSION, ensure_schema
+from app.crud import task as task_crud
+
+logger = logging.getLogger(__name__)
+
+# Варианты фильтров списка задач, запросы для которых компилируются заранее
+_LIST_FILTERS = [
+    {"completed": None},
+    {"completed": True},
+    {"completed": False},
+    {"completed": None, "tags": ["warmup"]},
+    {"completed": None, "any_tags": ["warmup"]},
+]
+
+
+async def warm_pool(db_engine: AsyncEngine, connections: int) -> int:
+    """
+    Открытие соединений пула заранее
+
+    Соединения открываются одновременно и удерживаются до открытия всех,
+    чтобы пул создал нужное количество разных соединений, а не переиспользовал одно.
+
+    Args:
+        db_engine: Движок базы данных
+        connections: Количество соединений
+
+    Returns:
+        Количество открытых соединений
+    """
+    opened = asyncio.Event()
+    ready = 0
+
+    async def hold() -> None:
+        nonlocal ready
+        async with db_engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+            ready += 1
+            if ready == connections:
+                opened.set()
+            await opened.wait()
+
+    await asyncio.gather(*(hold() for _ in range(connections)))
+    return ready
+
+
+async def warm_queries(session_factory: async_sessionmaker) -> int:
+    """
+    Выполнение горячих запросов на чтение для заполнения кэша компиляции SQLAlchemy
+
+    Args:
+        session_factory: Фабрика сессий базы данных
+
+    Returns:
+        Количество выполненных запросов
+    """
+    executed = 0
+    async with session_factory() as db:
+        await task_crud.get_task(db, 0)
+        executed += 1
+        for filters in _LIST_FILTERS:
+            await task_crud.get_tasks(db, skip=0, limit=1, **filters)
+            await task_crud.get_tasks_count(db, **filters)
+            executed += 2
+    return executed
+
+
+class StartupReport:
+    """
+    Измерение этапов запуска приложения
+    """
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self.migrations_applied: List[int] = []
+        self.warmup: Dict[str, int] = {}
+
+    def begin(self) -> None:
+        """
+        Начало отсчета времени запуска
+        """
+        self.started_at = time.perf_counter()
+        self.ready_at = None
+        self.phases = {}
+
+    def record(self, phase: str, started: float) -> None:
+        """
+        Запись длительности этапа
+
+        Args:
+            phase: Название этапа
+            started: Момент начала этапа (time.perf_counter)
+        """
+        self.phases[phase] = round((time.perf_counter() - started) * 1000, 3)
+
+    def finish(self) -> None:
+        """
+        Завершение отсчета: приложение готово принимать запросы
+        """
+        self.ready_at = time.perf_counter()
+        logger.info(
+            "Приложение готово за %.1f мс: %s", self.stats()["total_ms"], self.phases
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Статистика запуска для метрик
+
+        Returns:
+            Словарь с длительностями этапов и результатами прогрева
+        """
+        total_ms = None
+        if self.started_at is not None and self.ready_at is not None:
+            total_ms = round((self.ready_at - self.started_at) * 1000, 3)
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "migrations_applied": self.migrations_applied,
+            "phases_ms": dict(self.phases),
+            "total_ms": total_ms,
+            "warmup": dict(self.warmup),
+        }
+
+
+async def prepare(
+    db_engine: AsyncEngine,
+    session_factory: async_sessionmaker,
+    report: StartupReport,
+    warmup_enabled: bool = True,
+    warmup_connections: int = 5,
+) -> None:
+    """
+    Подготовка приложения к приему запросов: проверка схемы и прогрев
+
+    Args:
+        db_engine: Движок базы данных
+        session_factory: Фабрика сессий базы данных
+        report: Отчет о запуске
+        warmup_enabled: Выполнять ли прогрев
+        warmup_connections: Количество заранее открываемых соединений пула
+    """
+    report.begin()
+
+    started = time.perf_counter()
+    report.migrations_applied = await ensure_schema(db_engine)
+    report.record("schema", started)
+
+    if warmup_enabled:
+        started = time.perf_counter()
+        report.warmup["connections"] = await warm_pool(db_engine, warmup_connections)
+        report.record("pool", started)
+
+        started = time.perf_counter()
+        report.warmup["queries"] = await warm_queries(session_factory)
+        report.record("queries", started)
+
+    report.finish()
+
+
+# Глобальный отчет о запуске приложения
+startup_report = StartupReport()
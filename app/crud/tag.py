@@ -0,0 +1,151 @@
+"""
+CRUD операции для работы с тегами
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import task_list_flight
+from app.models.tag import Tag
+from app.schemas.tag import TagCreate, TagUpdate
+
+
+async def get_or_create_tags(db: AsyncSession, names: List[str]) -> List[Tag]:
+    """
+    Получение тегов по названиям с созданием недостающих
+
+    Недостающие теги создаются одним запросом INSERT ... ON CONFLICT DO NOTHING,
+    поэтому конкурентное создание одинаковых тегов не приводит к ошибке.
+    Изменения не фиксируются - это делает вызывающая операция.
+
+    Args:
+        db: Сессия базы данных
+        names: Нормализованные названия тегов
+
+    Returns:
+        Список тегов в порядке переданных названий
+    """
+    if not names:
+        return []
+
+    await db.execute(
+        insert(Tag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+    )
+    result = await db.execute(select(Tag).where(Tag.name.in_(names)))
+    tags = {tag.name: tag for tag in result.scalars().all()}
+    return [tags[name] for name in names]
+
+
+async def create_tag(db: AsyncSession, tag_data: TagCreate) -> Tag:
+    """
+    Создание нового тега
+
+    Args:
+        db: Сессия базы данных
+        tag_data: Данные для создания тега
+
+    Returns:
+        Созданный тег
+
+    Raises:
+        IntegrityError: Если тег с таким названием уже существует
+    """
+    tag = Tag(name=tag_data.name)
+    db.add(tag)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    await db.refresh(tag)
+    return tag
+
+
+async def get_tag(db: AsyncSession, tag_id: int) -> Optional[Tag]:
+    """
+    Получение тега по ID
+
+    Args:
+        db: Сессия базы данных
+        tag_id: ID тега
+
+    Returns:
+        Тег или None, если не найден
+    """
+    result = await db.execute(select(Tag).where(Tag.id == tag_id))
+    return result.scalar_one_or_none()
+
+
+async def get_tags(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Tag]:
+    """
+    Получение списка тегов, упорядоченного по названию
+
+    Args:
+        db: Сессия базы данных
+        skip: Количество пропускаемых записей
+        limit: Максимальное количество возвращаемых записей
+
+    Returns:
+        Список тегов
+    """
+    result = await db.execute(select(Tag).order_by(Tag.name).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+
+async def update_tag(
+    db: AsyncSession, tag_id: int, tag_data: TagUpdate
+) -> Optional[Tag]:
+    """
+    Переименование тега
+
+    Args:
+        db: Сессия базы данных
+        tag_id: ID тега
+        tag_data: Данные для обновления
+
+    Returns:
+        Обновленный тег или None, если не найден
+
+    Raises:
+        IntegrityError: Если тег с новым названием уже существует
+    """
+    tag = await get_tag(db, tag_id)
+    if not tag:
+        return None
+
+    try:
+        await db.execute(update(Tag).where(Tag.id == tag_id).values(name=tag_data.name))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    task_list_flight.invalidate()
+    await db.refresh(tag)
+    return tag
+
+
+async def delete_tag(db: AsyncSession, tag_id: int) -> bool:
+    """
+    Удаление тега (связи с задачами удаляются каскадно)
+
+    Args:
+        db: Сессия базы данных
+        tag_id: ID тега
+
+    Returns:
+        True, если тег был удален, False - если не найден
+    """
+    tag = await get_tag(db, tag_id)
+    if not tag:
+        return False
+
+    await db.execute(delete(Tag).where(Tag.id == tag_id))
+    await db.commit()
+    task_list_flight.invalidate()
+    return True
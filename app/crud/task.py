@@ -2,12 +2,16 @@
 CRUD операции для работы с задачами
 """
 
-from typing import List, Optional
+from datetime import timedelta
+from typing import List, Optional, Sequence
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import Select, delete, func, literal, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.task import Task
+from app.core.cache import task_list_flight
+from app.crud.tag import get_or_create_tags
+from app.models.tag import Tag, task_tags
+from app.models.task import Task, utc_now
 from app.schemas.task import TaskCreate, TaskUpdate
 
 
@@ -22,9 +26,11 @@ async def create_task(db: AsyncSession, task_data: TaskCreate) -> Task:
     Returns:
         Созданная задача
     """
-    task = Task(**task_data.model_dump())
+    task = Task(**task_data.model_dump(exclude={"tags"}))
+    task.tags = await get_or_create_tags(db, task_data.tags)
     db.add(task)
     await db.commit()
+    task_list_flight.invalidate()
     await db.refresh(task)
     return task
 
@@ -44,8 +50,50 @@ async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
     return result.scalar_one_or_none()
 
 
+def _filter_tasks(
+    query: Select,
+    completed: Optional[bool] = None,
+    tags: Sequence[str] = (),
+    any_tags: Sequence[str] = (),
+) -> Select:
+    """
+    Применение фильтров к запросу задач
+
+    Фильтры по тегам выполняются подзапросами по индексу (tag_id, task_id)
+    таблицы связей: для tags - пересечение (у задачи есть все теги),
+    для any_tags - объединение (у задачи есть хотя бы один тег).
+    """
+    if completed is not None:
+        query = query.where(Task.completed == completed)
+
+    if tags:
+        having_all = (
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.name.in_(tags))
+            .group_by(task_tags.c.task_id)
+            .having(func.count() == len(tags))  # pylint: disable=not-callable
+        )
+        query = query.where(Task.id.in_(having_all))
+
+    if any_tags:
+        having_any = (
+            select(task_tags.c.task_id)
+            .join(Tag, Tag.id == task_tags.c.tag_id)
+            .where(Tag.name.in_(any_tags))
+        )
+        query = query.where(Task.id.in_(having_any))
+
+    return query
+
+
 async def get_tasks(
-    db: AsyncSession, skip: int = 0, limit: int = 100, completed: Optional[bool] = None
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    completed: Optional[bool] = None,
+    tags: Sequence[str] = (),
+    any_tags: Sequence[str] = (),
 ) -> List[Task]:
     """
     Получение списка задач с фильтрацией и пагинацией
@@ -55,14 +103,13 @@ async def get_tasks(
         skip: Количество пропускаемых записей
         limit: Максимальное количество возвращаемых записей
         completed: Фильтр по статусу выполнения (None - все задачи)
+        tags: Нормализованные теги, которые должны быть у задачи все
+        any_tags: Нормализованные теги, хотя бы один из которых должен быть у задачи
 
     Returns:
         Список задач
     """
-    query = select(Task)
-
-    if completed is not None:
-        query = query.where(Task.completed == completed)
+    query = _filter_tasks(select(Task), completed, tags, any_tags)
 
     query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
 
@@ -94,9 +141,18 @@ async def update_task(
     if not update_data:
         return task
 
+    # Теги заменяются целиком, если переданы; связи хранятся в отдельной
+    # таблице, поэтому время обновления задачи выставляется явно
+    tag_names = update_data.pop("tags", None)
+    if tag_names is not None:
+        task.tags = await get_or_create_tags(db, tag_names)
+        update_data["updated_at"] = utc_now()
+
     # Выполняем обновление
-    await db.execute(update(Task).where(Task.id == task_id).values(**update_data))
+    if update_data:
+        await db.execute(update(Task).where(Task.id == task_id).values(**update_data))
     await db.commit()
+    task_list_flight.invalidate()
     await db.refresh(task)
     return task
 
@@ -120,25 +176,166 @@ async def delete_task(db: AsyncSession, task_id: int) -> bool:
     # Удаляем задачу
     await db.execute(delete(Task).where(Task.id == task_id))
     await db.commit()
+    task_list_flight.invalidate()
     return True
 
 
-async def get_tasks_count(db: AsyncSession, completed: Optional[bool] = None) -> int:
+async def get_tasks_count(
+    db: AsyncSession,
+    completed: Optional[bool] = None,
+    tags: Sequence[str] = (),
+    any_tags: Sequence[str] = (),
+) -> int:
     """
     Получение общего количества задач
 
     Args:
         db: Сессия базы данных
         completed: Фильтр по статусу выполнения (None - все задачи)
+        tags: Нормализованные теги, которые должны быть у задачи все
+        any_tags: Нормализованные теги, хотя бы один из которых должен быть у задачи
 
     Returns:
         Количество задач
     """
-    query = select(func.count(Task.id))  # pylint: disable=not-callable
-
-    if completed is not None:
-        query = query.where(Task.completed == completed)
+    query = _filter_tasks(
+        select(func.count(Task.id)),  # pylint: disable=not-callable
+        completed,
+        tags,
+        any_tags,
+    )
 
     result = await db.execute(query)
     count = result.scalar()
     return count if count is not None else 0
+
+
+async def claim_tasks(
+    db: AsyncSession, worker_id: str, limit: int, lease_seconds: int
+) -> List[Task]:
+    """
+    Атомарная аренда свободных задач воркером
+
+    Свободными считаются невыполненные задачи без аренды или с истекшей
+    арендой. Выбор и захват выполняются одним запросом UPDATE ... RETURNING,
+    поэтому конкурирующие воркеры никогда не получат одну и ту же задачу.
+
+    Args:
+        db: Сессия базы данных
+        worker_id: Идентификатор воркера
+        limit: Максимальное количество арендуемых задач
+        lease_seconds: Длительность аренды в секундах
+
+    Returns:
+        Список арендованных задач
+    """
+    now = utc_now()
+    # Свободные и просроченные задачи выбираются двумя диапазонными поисками
+    # по индексу состояния аренды: ни сортировки, ни полного сканирования
+    never_leased = (
+        select(Task.id)
+        .where(Task.completed.is_(False), Task.lease_expires_at.is_(None))
+        .order_by(Task.id)
+        .limit(limit)
+        .subquery()
+    )
+    expired = (
+        select(Task.id)
+        .where(Task.completed.is_(False), Task.lease_expires_at < now)
+        .order_by(Task.lease_expires_at)
+        .limit(limit)
+        .subquery()
+    )
+    # Просроченные задачи выдаются первыми: иначе, пока в очереди есть новые
+    # задачи, задачи упавших воркеров не выдавались бы никогда.
+    # Сортируется не больше 2 * limit кандидатов
+    candidates = union_all(
+        select(expired.c.id, literal(0).label("priority")),
+        select(never_leased.c.id, literal(1).label("priority")),
+    ).subquery()
+    claimed_ids = (
+        select(candidates.c.id)
+        .order_by(candidates.c.priority, candidates.c.id)
+        .limit(limit)
+    )
+
+    result = await db.execute(
+        update(Task)
+        .where(Task.id.in_(claimed_ids))
+        .values(
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            # Аренда не является изменением задачи
+            updated_at=Task.updated_at,
+        )
+        .returning(Task)
+    )
+    tasks = sorted(result.scalars().all(), key=lambda task: task.id)
+    await db.commit()
+    if tasks:
+        task_list_flight.invalidate()
+    return tasks
+
+
+async def extend_task_lease(
+    db: AsyncSession, task_id: int, worker_id: str, lease_seconds: int
+) -> Optional[Task]:
+    """
+    Продление аренды задачи (heartbeat)
+
+    Args:
+        db: Сессия базы данных
+        task_id: ID задачи
+        worker_id: Идентификатор воркера, владеющего арендой
+        lease_seconds: Новая длительность аренды в секундах от текущего момента
+
+    Returns:
+        Задача с продленной арендой или None, если воркер не владеет
+        действующей арендой задачи
+    """
+    now = utc_now()
+    result = await db.execute(
+        update(Task)
+        .where(
+            Task.id == task_id,
+            Task.lease_owner == worker_id,
+            Task.lease_expires_at >= now,
+        )
+        .values(
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            updated_at=Task.updated_at,
+        )
+        .returning(Task)
+    )
+    task = result.scalar_one_or_none()
+    await db.commit()
+    if task:
+        task_list_flight.invalidate()
+    return task
+
+
+async def release_task_lease(
+    db: AsyncSession, task_id: int, worker_id: str
+) -> Optional[Task]:
+    """
+    Освобождение аренды задачи
+
+    Args:
+        db: Сессия базы данных
+        task_id: ID задачи
+        worker_id: Идентификатор воркера, владеющего арендой
+
+    Returns:
+        Освобожденная задача или None, если аренда принадлежит другому воркеру
+    """
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.lease_owner == worker_id)
+        .values(lease_owner=None, lease_expires_at=None, updated_at=Task.updated_at)
+        .returning(Task)
+    )
+    task = result.scalar_one_or_none()
+    await db.commit()
+    if task:
+        task_list_flight.invalidate()
+    return task
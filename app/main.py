@@ -2,14 +2,22 @@
 Главный файл FastAPI приложения "Менеджер Задач"
 """
 
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
+from app.core.admission import AdmissionMiddleware, admission_controller
+from app.core.cache import task_list_flight
+from app.core.coherence import activity_board
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import AsyncSessionLocal, engine
+from app.core.maintenance import maintenance_leader, maintenance_scheduler
+from app.core.profiling import ProfilingMiddleware, install_db_timing, profile_store
+from app.core.warmup import prepare, startup_report
 
 
 @asynccontextmanager
@@ -17,9 +25,26 @@ async def lifespan(_app: FastAPI):
     """
     Обработчик жизненного цикла приложения
     """
-    # Создание таблиц в базе данных при запуске
-    await create_tables()
+    # Проверка версии схемы, миграции при необходимости и прогрев
+    await prepare(
+        engine,
+        AsyncSessionLocal,
+        startup_report,
+        warmup_enabled=settings.warmup_enabled,
+        warmup_connections=settings.warmup_connections,
+    )
+    # Общий для воркеров учет выполняющихся запросов
+    if activity_board is not None:
+        activity_board.open()
+    # Фоновое обслуживание базы данных (выполняет только воркер-лидер)
+    if settings.maintenance_enabled and engine.dialect.name == "sqlite":
+        maintenance_scheduler.start()
     yield
+    await maintenance_scheduler.stop()
+    if activity_board is not None:
+        activity_board.close()
+    if task_list_flight.watcher is not None:
+        task_list_flight.watcher.close()
 
 
 # Создание FastAPI приложения
@@ -55,6 +80,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Контроль допуска запросов при перегрузке
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        retry_after=settings.admission_retry_after,
+    )
+
+# Сжатие ответов с согласованием кодировки
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_level=settings.compression_brotli_level,
+        zstd_level=settings.compression_zstd_level,
+    )
+
 # Настройка CORS
 app.add_middleware(
     CORSMiddleware,
@@ -64,6 +107,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Профилирование отдельных запросов по заголовку X-Profile
+if settings.profiling_enabled:
+    install_db_timing(engine.sync_engine)
+    app.add_middleware(
+        ProfilingMiddleware, store=profile_store, token=settings.profiling_token
+    )
+
 # Подключение API роутеров
 app.include_router(api_router, prefix="/api/v1")
 
@@ -87,3 +137,18 @@ async def health_check():
     Проверка состояния приложения
     """
     return {"status": "OK", "message": "Приложение работает корректно"}
+
+
+@app.get("/metrics", tags=["Информация"])
+async def metrics():
+    """
+    Внутренние метрики процесса-воркера: контроль допуска, объединение запросов,
+    обслуживание базы данных и запуск приложения
+    """
+    return {
+        "worker": {"pid": os.getpid(), "maintenance_leader": maintenance_leader.held},
+        "admission": admission_controller.stats(),
+        "list_coalescing": task_list_flight.stats(),
+        "maintenance": maintenance_scheduler.stats(),
+        "startup": startup_report.stats(),
+    }
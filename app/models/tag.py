@@ -0,0 +1,39 @@
+"""
+Модель тега (метки) задачи для базы данных
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.task import utc_now
+
+# Связь задач и тегов (многие ко многим)
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # Обратный индекс для фильтрации задач по тегам:
+    # первичный ключ (task_id, tag_id) обслуживает загрузку тегов задач
+    Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+)
+
+
+class Tag(Base):
+    """
+    Модель тега в базе данных
+    """
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=utc_now, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name='{self.name}')>"
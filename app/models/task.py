@@ -3,12 +3,16 @@
 """
 
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.tag import Tag
+
 
 def utc_now():
     """Возвращает текущее время в UTC"""
@@ -33,5 +37,25 @@ class Task(Base):
         DateTime, default=utc_now, onupdate=utc_now, nullable=False
     )
 
+    # Аренда задачи воркером (очередь задач)
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+
+    # Теги загружаются одним пакетным запросом для всех задач выборки
+    tags: Mapped[List["Tag"]] = relationship(
+        secondary="task_tags",
+        lazy="selectin",
+        order_by="Tag.name",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        # Индекс по состоянию аренды: поиск свободных и просроченных задач
+        # выполняется диапазонным запросом без полного сканирования таблицы
+        Index("ix_tasks_lease_state", "completed", "lease_expires_at"),
+    )
+
     def __repr__(self) -> str:
         return f"<Task(id={self.id}, title='{self.title}', completed={self.completed})>"
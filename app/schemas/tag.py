@@ -0,0 +1,72 @@
+"""
+Pydantic схемы для тегов
+"""
+
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Максимальная длина названия тега
+TAG_NAME_MAX_LENGTH = 50
+
+
+def normalize_tag_name(name: str) -> str:
+    """
+    Нормализация названия тега: без пробелов по краям и в нижнем регистре
+
+    Raises:
+        ValueError: Если название пустое или слишком длинное
+    """
+    normalized = name.strip().lower()
+    if not normalized:
+        raise ValueError("Название тега не может быть пустым")
+    if len(normalized) > TAG_NAME_MAX_LENGTH:
+        raise ValueError(
+            f"Название тега не может быть длиннее {TAG_NAME_MAX_LENGTH} символов"
+        )
+    return normalized
+
+
+def normalize_tag_names(names: List[str]) -> List[str]:
+    """
+    Нормализация списка тегов с удалением повторов (порядок сохраняется)
+    """
+    return list(dict.fromkeys(normalize_tag_name(name) for name in names))
+
+
+class TagBase(BaseModel):
+    """
+    Базовая схема тега
+    """
+
+    name: str = Field(..., description="Название тега")
+
+    @field_validator("name")
+    @classmethod
+    def normalize_name(cls, value: str) -> str:
+        """Нормализация названия тега"""
+        return normalize_tag_name(value)
+
+
+class TagCreate(TagBase):
+    """
+    Схема для создания тега
+    """
+
+
+class TagUpdate(TagBase):
+    """
+    Схема для переименования тега
+    """
+
+
+class TagResponse(TagBase):
+    """
+    Схема для ответа API с информацией о теге
+    """
+
+    id: int = Field(..., description="Уникальный идентификатор тега")
+    created_at: datetime = Field(..., description="Дата и время создания тега")
+
+    model_config = ConfigDict(from_attributes=True)
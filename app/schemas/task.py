@@ -3,9 +3,12 @@ Pydantic схемы для задач
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.config import settings
+from app.schemas.tag import normalize_tag_names
 
 
 class TaskBase(BaseModel):
@@ -23,6 +26,14 @@ class TaskCreate(TaskBase):
     Схема для создания новой задачи
     """
 
+    tags: List[str] = Field(default_factory=list, description="Теги задачи")
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, value: List[str]) -> List[str]:
+        """Нормализация тегов задачи"""
+        return normalize_tag_names(value)
+
 
 class TaskUpdate(BaseModel):
     """
@@ -34,6 +45,15 @@ class TaskUpdate(BaseModel):
     )
     description: Optional[str] = Field(None, description="Описание задачи")
     completed: Optional[bool] = Field(None, description="Статус выполнения задачи")
+    tags: Optional[List[str]] = Field(
+        None, description="Теги задачи (заменяют текущие теги)"
+    )
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        """Нормализация тегов задачи"""
+        return normalize_tag_names(value) if value is not None else None
 
 
 class TaskResponse(TaskBase):
@@ -46,5 +66,75 @@ class TaskResponse(TaskBase):
     updated_at: datetime = Field(
         ..., description="Дата и время последнего обновления задачи"
     )
+    lease_owner: Optional[str] = Field(
+        None, description="Идентификатор воркера, арендовавшего задачу"
+    )
+    lease_expires_at: Optional[datetime] = Field(
+        None, description="Дата и время истечения аренды задачи"
+    )
+    tags: List[str] = Field(default_factory=list, description="Теги задачи")
 
     model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def tag_names(cls, value: Any) -> Any:
+        """Преобразование тегов модели базы данных в их названия"""
+        return [getattr(tag, "name", tag) for tag in value]
+
+
+class TaskClaimRequest(BaseModel):
+    """
+    Схема запроса на аренду свободных задач воркером
+    """
+
+    worker_id: str = Field(
+        ..., min_length=1, max_length=100, description="Идентификатор воркера"
+    )
+    limit: int = Field(
+        1,
+        ge=1,
+        le=settings.claim_max_batch,
+        description="Максимальное количество арендуемых задач",
+    )
+    lease_seconds: int = Field(
+        settings.lease_default_seconds,
+        ge=1,
+        le=settings.lease_max_seconds,
+        description="Длительность аренды в секундах",
+    )
+
+
+class TaskLeaseExtendRequest(BaseModel):
+    """
+    Схема запроса на продление аренды задачи (heartbeat)
+    """
+
+    worker_id: str = Field(
+        ..., min_length=1, max_length=100, description="Идентификатор воркера"
+    )
+    lease_seconds: int = Field(
+        settings.lease_default_seconds,
+        ge=1,
+        le=settings.lease_max_seconds,
+        description="Новая длительность аренды в секундах от текущего момента",
+    )
+
+
+class TaskLeaseReleaseRequest(BaseModel):
+    """
+    Схема запроса на освобождение аренды задачи
+    """
+
+    worker_id: str = Field(
+        ..., min_length=1, max_length=100, description="Идентификатор воркера"
+    )
+
+
+class TaskClaimResponse(BaseModel):
+    """
+    Схема ответа со списком арендованных задач
+    """
+
+    tasks: List[TaskResponse]
+    worker_id: str
@@ -0,0 +1,43 @@
+"""
+Запуск приложения с несколькими воркерами
+
+Запуск:
+    WORKERS=4 python -m app.serve
+
+Все воркеры работают с одним файлом SQLite: схема проверяется и мигрируется
+под блокировкой записи, кэши списков задач согласуются через PRAGMA data_version,
+а фоновое обслуживание базы данных выполняет только один воркер.
+"""
+
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    """
+    Количество воркеров по умолчанию - по числу доступных процессу ядер
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS, Windows
+        return os.cpu_count() or 1
+
+
+def main() -> None:
+    """
+    Запуск uvicorn с настройками приложения
+    """
+    workers = settings.workers if settings.workers > 0 else default_workers()
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
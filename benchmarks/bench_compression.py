@@ -0,0 +1,90 @@
+"""
+Бенчмарк сжатия ответов: затраты CPU против размера ответа
+
+Запуск:
+    python -m benchmarks.bench_compression
+"""
+
+import time
+from typing import Callable, List
+
+from app.core.compression import (
+    BrotliCompressor,
+    Compressor,
+    GzipCompressor,
+    ZstdCompressor,
+    brotli,
+    zstandard,
+)
+from benchmarks.payloads import PAGE_SIZES, make_task_page
+
+# Проверяемые уровни сжатия для каждой кодировки
+LEVELS = {
+    "gzip": [1, 2, 3, 4, 5, 6, 9],
+    "br": [1, 2, 3, 4, 5, 6, 9],
+    "zstd": [1, 2, 3, 4, 5, 6, 12],
+}
+
+
+def make_payload(page_size: int) -> bytes:
+    """
+    Формирование ответа списка задач с описаниями
+    """
+    return make_task_page(page_size).model_dump_json().encode()
+
+
+def factories() -> List[tuple]:
+    """
+    Компрессоры, доступные в текущем окружении
+    """
+    result = [
+        ("gzip", level, lambda lvl=level: GzipCompressor(lvl))
+        for level in LEVELS["gzip"]
+    ]
+    if brotli is not None:
+        result += [
+            ("br", level, lambda lvl=level: BrotliCompressor(lvl))
+            for level in LEVELS["br"]
+        ]
+    if zstandard is not None:
+        result += [
+            ("zstd", level, lambda lvl=level: ZstdCompressor(lvl))
+            for level in LEVELS["zstd"]
+        ]
+    return result
+
+
+def measure(factory: Callable[[], Compressor], payload: bytes) -> tuple:
+    """
+    Измерение среднего времени сжатия и размера результата
+    """
+    compressed = factory().finish(payload)
+    iterations = max(5, int(2_000_000 / len(payload)))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        factory().finish(payload)
+    elapsed = (time.perf_counter() - started) / iterations
+    return elapsed, len(compressed)
+
+
+def main() -> None:
+    """
+    Запуск бенчмарка и вывод результатов
+    """
+    print(
+        f"{'задач':>6} {'исходный':>10} {'кодировка':>10} {'уровень':>8} "
+        f"{'размер':>10} {'степень':>8} {'мс':>8} {'МБ/с':>8}"
+    )
+    for page_size in PAGE_SIZES:
+        payload = make_payload(page_size)
+        for encoding, level, factory in factories():
+            elapsed, size = measure(factory, payload)
+            print(
+                f"{page_size:>6} {len(payload):>10} {encoding:>10} {level:>8} "
+                f"{size:>10} {len(payload) / size:>8.1f} {elapsed * 1000:>8.3f} "
+                f"{len(payload) / elapsed / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Бенчмарк форматов MessagePack и JSON: кодирование, декодирование и размер
+
+Запуск:
+    python -m benchmarks.bench_msgpack
+"""
+
+import json
+import time
+from typing import Callable
+
+from app.api.v1.endpoints.tasks import TaskListResponse
+from app.core.serialization import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, encode, unpackb
+from benchmarks.payloads import PAGE_SIZES, make_task_page
+
+
+def measure(fn: Callable[[], object], payload_size: int) -> float:
+    """
+    Среднее время выполнения операции в миллисекундах
+    """
+    iterations = max(20, int(5_000_000 / payload_size))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> None:
+    """
+    Запуск бенчмарка и вывод результатов
+    """
+    decoders = {JSON_MEDIA_TYPE: json.loads, MSGPACK_MEDIA_TYPE: unpackb}
+    print(
+        f"{'задач':>6} {'формат':>20} {'размер':>10} {'кодир. мс':>10} "
+        f"{'декод. мс':>10} {'декод.+модель мс':>17}"
+    )
+    for page_size in PAGE_SIZES:
+        page = make_task_page(page_size)
+        for media_type, decode in decoders.items():
+            body = encode(page, media_type)
+            encode_ms = measure(lambda: encode(page, media_type), len(body))
+            decode_ms = measure(lambda: decode(body), len(body))
+            validate_ms = measure(
+                lambda: TaskListResponse.model_validate(decode(body)), len(body)
+            )
+            print(
+                f"{page_size:>6} {media_type:>20} {len(body):>10} {encode_ms:>10.3f} "
+                f"{decode_ms:>10.3f} {validate_ms:>17.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
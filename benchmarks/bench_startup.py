@@ -0,0 +1,128 @@
+"""
+Бенчмарк запуска: время старта и латентность первых запросов в трех режимах
+
+- create_all: прежний запуск с create_all без прогрева (базовая линия)
+- schema: проверка версии схемы без прогрева
+- warmup: проверка версии схемы и прогрев
+
+Каждый замер выполняется в отдельном процессе, чтобы пул соединений
+и кэш компиляции SQLAlchemy были холодными.
+
+Запуск:
+    python -m benchmarks.bench_startup
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNS = 5
+FIRST_REQUESTS = 3
+PATHS = ["/api/v1/tasks/?completed=false", "/api/v1/tasks/?tags=warmup"]
+MODES = ["create_all", "schema", "warmup"]
+
+
+async def measure_process(mode: str) -> dict:
+    """
+    Замер в текущем процессе: запуск приложения и первые запросы
+    """
+    import_started = time.perf_counter()
+    from httpx import (  # pylint: disable=import-outside-toplevel
+        ASGITransport,
+        AsyncClient,
+    )
+
+    from app import main  # pylint: disable=import-outside-toplevel
+    from app.core.database import (  # pylint: disable=import-outside-toplevel
+        create_tables,
+    )
+
+    app = main.app
+    if mode == "create_all":
+        # Прежний путь запуска: create_all вместо проверки версии схемы
+        async def prepare_create_all(*_args, **_kwargs) -> None:
+            await create_tables()
+
+        main.prepare = prepare_create_all
+
+    import_ms = (time.perf_counter() - import_started) * 1000
+    async with app.router.lifespan_context(app):
+        startup_ms = (time.perf_counter() - import_started) * 1000 - import_ms
+        latencies = []
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(FIRST_REQUESTS):
+                # Одновременные запросы требуют нескольких соединений пула
+                started = time.perf_counter()
+                await asyncio.gather(*(client.get(path) for path in PATHS * 2))
+                latencies.append((time.perf_counter() - started) * 1000)
+    return {"import_ms": import_ms, "startup_ms": startup_ms, "requests_ms": latencies}
+
+
+def run_child(mode: str, database: str) -> dict:
+    """
+    Запуск замера в отдельном процессе
+    """
+    env = dict(
+        os.environ,
+        WARMUP_ENABLED=str(mode == "warmup").lower(),
+        MAINTENANCE_ENABLED="false",
+        DATABASE_URL=f"sqlite+aiosqlite:///{database}",
+    )
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """
+    Запуск бенчмарка и вывод результатов
+    """
+    header = " ".join(f"{f'запрос {i + 1} мс':>12}" for i in range(FIRST_REQUESTS))
+    print(
+        f"{'режим':>10} {'импорт мс':>10} {'старт мс':>10} {header} "
+        f"{'старт+запрос 1 мс':>18}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "bench.db")
+        # Первый запуск создает схему и в замерах не учитывается
+        run_child("schema", database)
+        # Режимы чередуются, чтобы фоновые колебания нагрузки влияли на них одинаково
+        results = {mode: [] for mode in MODES}
+        for _ in range(RUNS):
+            for mode in MODES:
+                results[mode].append(run_child(mode, database))
+
+    def avg(values):
+        return sum(values) / len(values)
+
+    for mode, runs in results.items():
+        requests_ms = " ".join(
+            f"{avg([r['requests_ms'][i] for r in runs]):>12.2f}"
+            for i in range(FIRST_REQUESTS)
+        )
+        # Время от начала запуска до ответа на первую пачку запросов
+        total_ms = avg([r["startup_ms"] + r["requests_ms"][0] for r in runs])
+        print(
+            f"{mode:>10} "
+            f"{avg([r['import_ms'] for r in runs]):>10.2f} "
+            f"{avg([r['startup_ms'] for r in runs]):>10.2f} {requests_ms} "
+            f"{total_ms:>18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child_mode = sys.argv[sys.argv.index("--child") + 1]
+        print(json.dumps(asyncio.run(measure_process(child_mode))))
+    else:
+        main()
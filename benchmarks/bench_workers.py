@@ -0,0 +1,214 @@
+"""
+Бенчмарк масштабирования пропускной способности от 1 до N воркеров
+
+Для каждого количества воркеров запускается `python -m app.serve` с отдельной
+базой данных, после чего несколько процессов-клиентов в течение заданного
+времени отправляют смешанную нагрузку: чтение списка задач и создание задач.
+Каждое количество воркеров измеряется без кэша списка (LIST_CACHE_TTL=0) и с
+кэшем, чтобы были видны доля попаданий и затраты на проверку data_version.
+
+Запуск:
+    python -m benchmarks.bench_workers [максимальное количество воркеров]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from app.serve import default_workers
+
+DURATION = 5.0
+CLIENT_PROCESSES = 4
+CONNECTIONS_PER_CLIENT = 16
+WRITE_RATIO = 0.1
+SEED_TASKS = 200
+LIST_CACHE_TTLS = [0.0, 1.0]
+
+
+def free_port() -> int:
+    """
+    Свободный TCP порт для запуска сервера
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    workers: int, port: int, database: str, list_cache_ttl: float
+) -> subprocess.Popen:
+    """
+    Запуск сервера и ожидание готовности всех воркеров
+    """
+    env = dict(
+        os.environ,
+        WORKERS=str(workers),
+        HOST="127.0.0.1",
+        PORT=str(port),
+        DATABASE_URL=f"sqlite+aiosqlite:///{database}",
+        ADMISSION_ENABLED="false",
+        LIST_CACHE_TTL=str(list_cache_ttl),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    pids = set()
+    deadline = time.monotonic() + 30
+    # Запросы распределяются между воркерами, ждем ответа от каждого
+    while len(pids) < workers:
+        if time.monotonic() > deadline:
+            server.kill()
+            raise RuntimeError("Сервер не запустился")
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1)
+            pids.add(response.json()["worker"]["pid"])
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    return server
+
+
+def collect_cache_stats(port: int, workers: int) -> Dict[str, int]:
+    """
+    Суммарная статистика кэша списка задач по всем воркерам
+
+    Каждый запрос /metrics попадает в один из воркеров, поэтому опрос
+    повторяется, пока не будет получена статистика каждого из них.
+    """
+    per_worker: Dict[int, dict] = {}
+    deadline = time.monotonic() + 10
+    while len(per_worker) < workers and time.monotonic() < deadline:
+        metrics = httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).json()
+        per_worker[metrics["worker"]["pid"]] = metrics["list_coalescing"]
+
+    totals = {"hits": 0, "coalesced": 0, "executions": 0, "polls": 0, "changes": 0}
+    for stats in per_worker.values():
+        for name in ("hits", "coalesced", "executions"):
+            totals[name] += stats[name]
+        if stats["coherence"] is not None:
+            totals["polls"] += stats["coherence"]["polls"]
+            totals["changes"] += stats["coherence"]["changes"]
+    return totals
+
+
+async def client_loop(port: int, deadline: float) -> Tuple[int, List[float]]:
+    """
+    Нагрузка из одного процесса-клиента
+    """
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=CONNECTIONS_PER_CLIENT)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}/api/v1", limits=limits, timeout=30
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                if random.random() < WRITE_RATIO:
+                    response = await client.post(
+                        "/tasks/", json={"title": "Нагрузка", "tags": ["bench"]}
+                    )
+                else:
+                    response = await client.get(
+                        "/tasks/", params={"limit": 20, "completed": False}
+                    )
+                if response.is_success:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(CONNECTIONS_PER_CLIENT)))
+    return errors, latencies
+
+
+def run_client(port: int, deadline: float, results) -> None:
+    """
+    Точка входа процесса-клиента
+    """
+    results.put(asyncio.run(client_loop(port, deadline)))
+
+
+def measure(
+    workers: int, list_cache_ttl: float
+) -> Tuple[float, float, float, int, Dict[str, int]]:
+    """
+    Замер пропускной способности для заданного количества воркеров
+
+    Returns:
+        Запросов в секунду, p50 и p99 латентности в мс, количество ошибок
+        и статистика кэша списка задач
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        port = free_port()
+        server = start_server(
+            workers, port, os.path.join(directory, "bench.db"), list_cache_ttl
+        )
+        try:
+            for _ in range(SEED_TASKS):
+                httpx.post(
+                    f"http://127.0.0.1:{port}/api/v1/tasks/", json={"title": "Задача"}
+                )
+
+            results = multiprocessing.Queue()
+            deadline = time.monotonic() + DURATION
+            clients = [
+                multiprocessing.Process(
+                    target=run_client, args=(port, deadline, results)
+                )
+                for _ in range(CLIENT_PROCESSES)
+            ]
+            for client in clients:
+                client.start()
+            collected = [results.get() for _ in clients]
+            for client in clients:
+                client.join()
+            cache_stats = collect_cache_stats(port, workers)
+        finally:
+            server.terminate()
+            server.wait()
+
+    errors = sum(errors for errors, _ in collected)
+    latencies = sorted(latency for _, client in collected for latency in client)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return len(latencies) / DURATION, p50, p99, errors, cache_stats
+
+
+def main() -> None:
+    """
+    Запуск бенчмарка и вывод результатов
+    """
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else default_workers()
+    print(f"ядер доступно: {default_workers()}")
+    print(
+        f"{'воркеров':>8} {'TTL с':>6} {'запр./с':>10} {'p50 мс':>8} {'p99 мс':>8} "
+        f"{'ошибок':>7} {'попаданий':>10} {'проверок':>9} {'изменений':>10}"
+    )
+    counts = sorted({1, *range(2, max_workers + 1, 2), max_workers})
+    for workers in counts:
+        for ttl in LIST_CACHE_TTLS:
+            rps, p50, p99, errors, cache = measure(workers, ttl)
+            lookups = cache["hits"] + cache["coalesced"] + cache["executions"]
+            hit_rate = cache["hits"] / lookups * 100 if lookups else 0.0
+            print(
+                f"{workers:>8} {ttl:>6.1f} {rps:>10.0f} {p50:>8.1f} {p99:>8.1f} "
+                f"{errors:>7} {hit_rate:>9.1f}% {cache['polls']:>9} "
+                f"{cache['changes']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Тестовые данные для бенчмарков
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.api.v1.endpoints.tasks import TaskListResponse
+from app.schemas.task import TaskResponse
+
+# Типичные размеры страниц списка задач
+PAGE_SIZES = [50, 100, 1000]
+
+# Фиксированное зерно, чтобы результаты запусков были сопоставимы
+SEED = 20240601
+
+ACTIONS = [
+    "Подготовить",
+    "Проверить",
+    "Согласовать",
+    "Обновить",
+    "Исправить",
+    "Перенести",
+    "Описать",
+    "Протестировать",
+    "Разобрать",
+    "Настроить",
+    "Удалить",
+    "Оптимизировать",
+]
+SUBJECTS = [
+    "отчет о продажах",
+    "миграцию базы данных",
+    "форму регистрации",
+    "договор с поставщиком",
+    "интеграцию с платежным шлюзом",
+    "резервное копирование",
+    "документацию API",
+    "ошибку импорта CSV",
+    "макет главной страницы",
+    "квартальный бюджет",
+    "мониторинг очередей",
+    "права доступа сотрудников",
+    "уведомления по email",
+    "поиск по каталогу",
+]
+CONTEXTS = [
+    "за {month}",
+    "для клиента {client}",
+    "в релизе {version}",
+    "по заявке #{ticket}",
+    "на стенде {stand}",
+    "",
+    "",
+]
+SENTENCES = [
+    "{person} просит закончить до {day} {month_gen}.",
+    "Подробности в заявке #{ticket}, там же логи и скриншоты.",
+    "После изменений прогнать регрессионные тесты на стенде {stand}.",
+    "Ошибка воспроизводится примерно в {percent}% запросов при нагрузке выше {rps} RPS.",
+    "Нужно сверить цифры с выгрузкой из бухгалтерии, расхождение {amount} руб.",
+    "Согласовать текст с юристами и отправить {client} на подпись.",
+    "Блокирует выпуск версии {version}.",
+    "Старое поведение оставить за флагом до конца месяца.",
+    "Оценка - {hours} ч, основная часть - проверка граничных случаев.",
+    "Созвон с командой {team} в {hour}:{minute:02d}, ссылка в календаре.",
+    "Если не успеваем, перенести часть работ в следующий спринт.",
+    "Проверить, что индексы используются: посмотреть EXPLAIN QUERY PLAN.",
+    "Макеты лежат в общей папке, последняя версия от {day} {month_gen}.",
+    "Не забыть обновить CHANGELOG и README.",
+]
+MONTHS = ["январь", "февраль", "март", "апрель", "май", "июнь", "июль"]
+MONTHS_GEN = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля"]
+CLIENTS = ["ООО «Ромашка»", "АО «Вектор»", "ИП Соколов", "ГК «Северный порт»"]
+PEOPLE = ["Анна", "Дмитрий", "Ольга", "Игорь", "Мария", "Сергей", "Екатерина"]
+TEAMS = ["бэкенда", "мобильной разработки", "аналитики", "поддержки"]
+STANDS = ["staging", "preprod", "qa-2", "demo"]
+TAGS = [
+    "backend",
+    "frontend",
+    "bug",
+    "urgent",
+    "finance",
+    "docs",
+    "devops",
+    "client",
+    "research",
+    "tech-debt",
+]
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    """
+    Подстановка случайных значений в шаблон текста
+    """
+    return template.format(
+        month=rng.choice(MONTHS),
+        month_gen=rng.choice(MONTHS_GEN),
+        day=rng.randint(1, 28),
+        client=rng.choice(CLIENTS),
+        person=rng.choice(PEOPLE),
+        team=rng.choice(TEAMS),
+        stand=rng.choice(STANDS),
+        version=f"{rng.randint(1, 4)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}",
+        ticket=rng.randint(1000, 99999),
+        percent=rng.randint(1, 40),
+        rps=rng.choice([50, 100, 200, 500, 1000]),
+        amount=f"{rng.randint(1, 999)} {rng.randint(0, 999):03d}",
+        hours=rng.randint(1, 24),
+        hour=rng.randint(9, 18),
+        minute=rng.choice([0, 15, 30, 45]),
+    )
+
+
+def make_task(task_id: int, now: datetime, rng: random.Random) -> TaskResponse:
+    """
+    Формирование задачи с правдоподобными и разнообразными данными
+    """
+    title = " ".join(
+        part
+        for part in (
+            rng.choice(ACTIONS),
+            rng.choice(SUBJECTS),
+            _fill(rng.choice(CONTEXTS), rng),
+        )
+        if part
+    )
+    # Часть задач без описания, остальные - от одного до пяти предложений
+    description = None
+    if rng.random() < 0.8:
+        sentences = rng.sample(SENTENCES, rng.randint(1, 5))
+        description = " ".join(_fill(sentence, rng) for sentence in sentences)
+    created_at = now - timedelta(seconds=rng.randint(60, 90 * 24 * 3600))
+    updated_at = created_at + timedelta(
+        seconds=rng.randint(0, int((now - created_at).total_seconds()))
+    )
+    leased = rng.random() < 0.1
+    return TaskResponse(
+        id=task_id,
+        title=title,
+        description=description,
+        completed=rng.random() < 0.35,
+        created_at=created_at.replace(microsecond=rng.randint(0, 999999)),
+        updated_at=updated_at.replace(microsecond=rng.randint(0, 999999)),
+        lease_owner=f"worker-{rng.randint(1, 8)}" if leased else None,
+        lease_expires_at=(
+            now + timedelta(seconds=rng.randint(10, 300)) if leased else None
+        ),
+        tags=sorted(rng.sample(TAGS, rng.randint(0, 3))),
+    )
+
+
+def make_task_page(page_size: int) -> TaskListResponse:
+    """
+    Формирование страницы списка задач с описаниями
+    """
+    rng = random.Random(SEED + page_size)
+    # Даты без часового пояса, как при чтении из SQLite
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    start = rng.randint(1, 50000)
+    tasks = [make_task(start + i, now, rng) for i in range(page_size)]
+    return TaskListResponse(tasks=tasks, total=10 * page_size, skip=0, limit=page_size)
@@ -0,0 +1,99 @@
+"""
+Тесты контроля допуска запросов
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    ConcurrencyLimiter,
+)
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_when_queue_is_full():
+    """Тест отклонения запросов при заполненной очереди"""
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1.0)
+    assert await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    # Очередь заполнена - запрос отклоняется сразу
+    assert not await limiter.acquire()
+    assert limiter.shed_queue_full == 1
+
+    limiter.release()
+    assert await waiter
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_after_queue_timeout():
+    """Тест отклонения запроса по истечении времени ожидания"""
+    limiter = ConcurrencyLimiter(limit=1, queue_size=10, queue_timeout=0.01)
+    assert await limiter.acquire()
+
+    assert not await limiter.acquire()
+    assert limiter.shed_timeout == 1
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_503_with_retry_after():
+    """Тест быстрого ответа 503 для отклоненных запросов"""
+    release = asyncio.Event()
+    controller = AdmissionController(
+        read_limit=1, write_limit=1, queue_size=0, queue_timeout=1.0
+    )
+    test_app = FastAPI()
+    test_app.add_middleware(AdmissionMiddleware, controller=controller, retry_after=7)
+
+    @test_app.get("/api/slow")
+    async def slow():
+        await release.wait()
+        return {"status": "OK"}
+
+    @test_app.post("/api/write")
+    async def write():
+        return {"status": "OK"}
+
+    async with AsyncClient(app=test_app, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/api/slow"))
+        while not controller.reads.active:
+            await asyncio.sleep(0)
+
+        response = await client.get("/api/slow")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+
+        # Лимит на запись не зависит от запросов на чтение
+        response = await client.post("/api/write")
+        assert response.status_code == 200
+
+        release.set()
+        assert (await first).status_code == 200
+
+    stats = controller.stats()
+    assert stats["reads"]["shed"] == 1
+    assert stats["reads"]["admitted"] == 1
+    assert stats["writes"]["admitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    """Тест endpoint с метриками"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        data = response.json()
+        assert "queue_depth" in data["admission"]["reads"]
+        assert "shed" in data["admission"]["writes"]
@@ -0,0 +1,139 @@
+"""
+Тесты согласованности кэшей между процессами
+"""
+
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from app.core.cache import SingleFlight
+from app.core.coherence import (
+    ActivityBoard,
+    DataVersionWatcher,
+    LeaderLock,
+    sqlite_path,
+)
+
+
+def write_in_other_process(path):
+    """Фиксация изменения базы данных из отдельного процесса"""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); "
+            "conn.execute('INSERT INTO items VALUES (1)'); conn.commit()",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def test_sqlite_path():
+    """Тест определения файла базы данных по URL подключения"""
+    assert sqlite_path("sqlite+aiosqlite:///./tasks.db") == "./tasks.db"
+    assert sqlite_path("sqlite+aiosqlite:///:memory:") is None
+    assert sqlite_path("postgresql+asyncpg://user@localhost/tasks") is None
+
+
+def test_watcher_detects_other_process(tmp_path):
+    """Тест обнаружения изменений, зафиксированных другим процессом"""
+    path = tmp_path / "watched.db"
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE items (value INTEGER)")
+    conn.close()
+
+    watcher = DataVersionWatcher(str(path))
+    assert not watcher.changed()
+    assert not watcher.changed()
+
+    write_in_other_process(path)
+    assert watcher.changed()
+    assert not watcher.changed()
+    assert watcher.stats()["changes"] == 1
+
+    # С интервалом опроса изменения обнаруживаются не чаще одного раза за интервал
+    watcher.poll_interval = 3600
+    assert not watcher.changed()
+    write_in_other_process(path)
+    assert not watcher.changed()
+    watcher.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_result_dropped_after_external_write(tmp_path):
+    """Тест сброса кэша single-flight после изменения данных другим процессом"""
+    path = tmp_path / "cached.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (value INTEGER)")
+    conn.close()
+
+    watcher = DataVersionWatcher(str(path))
+    flight = SingleFlight(ttl=60, watcher=watcher)
+
+    async def count():
+        with sqlite3.connect(path) as reader:
+            return reader.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    assert await flight.do("count", count) == 0
+    assert await flight.do("count", count) == 0
+    assert flight.hits == 1
+
+    write_in_other_process(path)
+    assert await flight.do("count", count) == 1
+    assert flight.generation == 1
+    watcher.close()
+
+
+def test_leader_lock(tmp_path):
+    """Тест выбора единственного лидера"""
+    path = str(tmp_path / "maintenance.lock")
+    first = LeaderLock(path)
+    second = LeaderLock(path)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert first.held and not second.held
+
+    first.release()
+    assert second.acquire()
+    second.release()
+
+    # Без файла блокировки лидером считается каждый процесс
+    assert LeaderLock(None).acquire()
+
+
+def test_activity_board_across_processes(tmp_path):
+    """Тест учета запросов другого воркера и освобождения слота после его падения"""
+    path = str(tmp_path / "tasks.db.activity")
+    board = ActivityBoard(path, slots=4)
+    board.open()
+    assert board.is_idle()
+
+    # Другой воркер выполняет запрос и завершается, не освободив слот
+    worker = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from app.core.coherence import ActivityBoard; "
+            "board = ActivityBoard(sys.argv[1], slots=4); board.open(); "
+            "board.publish(1); print('ready', flush=True); sys.stdin.readline()",
+            path,
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert worker.stdout.readline().strip() == "ready"
+    assert board.busy_workers() == 1
+    assert not board.is_idle()
+
+    worker.communicate("\n")
+    assert board.is_idle()
+
+    board.publish(2)
+    assert board.busy_workers() == 1
+    board.close()
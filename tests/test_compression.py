@@ -0,0 +1,119 @@
+"""
+Тесты сжатия ответов
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from httpx import AsyncClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = "задача " * 1000
+
+
+def make_app(**options) -> FastAPI:
+    """
+    Тестовое приложение с middleware сжатия
+    """
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, **options)
+
+    @test_app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @test_app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @test_app.get("/encoded")
+    async def encoded():
+        return Response(
+            gzip.compress(LARGE_BODY.encode()), headers={"Content-Encoding": "gzip"}
+        )
+
+    @test_app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield LARGE_BODY.encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return test_app
+
+
+def test_negotiate_encoding():
+    """Тест выбора кодировки по заголовку Accept-Encoding"""
+    supported = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, deflate", supported) == "gzip"
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", supported) == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0", supported) is None
+    assert negotiate_encoding("*", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding("", supported) is None
+
+
+@pytest.mark.asyncio
+async def test_gzip_large_response():
+    """Тест сжатия большого ответа и пропуска маленького"""
+    async with AsyncClient(app=make_app(), base_url="http://test") as client:
+        headers = {"Accept-Encoding": "gzip"}
+        response = await client.get("/large", headers=headers)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < len(LARGE_BODY.encode())
+        assert response.text == LARGE_BODY
+
+        response = await client.get("/small", headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert response.text == "ok"
+
+        response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_already_encoded_response_is_not_recompressed():
+    """Тест того, что ответ с собственной кодировкой не сжимается повторно"""
+    async with AsyncClient(app=make_app(), base_url="http://test") as client:
+        response = await client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.text == LARGE_BODY
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_by_chunks():
+    """Тест потокового сжатия ответа"""
+    async with AsyncClient(app=make_app(), base_url="http://test") as client:
+        response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert response.text == LARGE_BODY * 3
+
+
+@pytest.mark.asyncio
+async def test_zstd_and_brotli():
+    """Тест сжатия zstd и brotli при наличии библиотек"""
+    brotli = pytest.importorskip("brotli")
+    zstandard = pytest.importorskip("zstandard")
+
+    async with AsyncClient(app=make_app(), base_url="http://test") as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "br"})
+        assert response.headers["Content-Encoding"] == "br"
+        # Декодирование br может выполняться клиентом автоматически
+        body = response.content
+        if body != LARGE_BODY.encode():
+            body = brotli.decompress(body)
+        assert body == LARGE_BODY.encode()
+
+        response = await client.get("/large", headers={"Accept-Encoding": "zstd, gzip"})
+        assert response.headers["Content-Encoding"] == "zstd"
+        assert (
+            zstandard.ZstdDecompressor().decompressobj().decompress(response.content)
+            == LARGE_BODY.encode()
+        )
@@ -0,0 +1,246 @@
+"""
+Тесты фонового обслуживания базы данных
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.coherence import LeaderLock
+from app.core.database import set_sqlite_pragmas
+from app.core.maintenance import MaintenanceScheduler
+
+
+@pytest.mark.asyncio
+async def test_maintenance_jobs_report(tmp_path):
+    """Тест выполнения заданий обслуживания и формирования отчетов"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/maintenance.db")
+    event.listen(test_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+    async with test_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE items (data TEXT)")
+        for _ in range(200):
+            await conn.exec_driver_sql("INSERT INTO items VALUES (randomblob(2000))")
+    async with test_engine.begin() as conn:
+        await conn.exec_driver_sql("DELETE FROM items")
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=5,
+        idle_wait=0,
+    )
+    reports = await scheduler.run_once()
+    await test_engine.dispose()
+
+    assert all(report["status"] == "ok" for report in reports.values())
+
+    vacuum = reports["incremental_vacuum"]
+    assert vacuum["free_pages_before"] > 0
+    assert vacuum["free_pages_after"] == 0
+    assert vacuum["steps"] > 1
+
+    assert reports["integrity_check"]["ok"]
+    assert "checkpointed_frames" in reports["wal_checkpoint"]
+    assert "duration_ms" in reports["optimize"]
+
+    # Проверка целостности выполняется не чаще integrity_interval
+    reports = await scheduler.run_once()
+    assert reports["integrity_check"]["started_at"] < reports["optimize"]["started_at"]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_waits_for_idle(tmp_path):
+    """Тест того, что задания не запускаются во время обработки запросов"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/idle.db")
+    checks = []
+
+    def is_idle():
+        checks.append(True)
+        return len(checks) > 3
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=1,
+        idle_wait=5,
+        is_idle=is_idle,
+    )
+    await scheduler.run_once()
+    await test_engine.dispose()
+
+    assert len(checks) >= 4
+    assert scheduler.reports["optimize"]["status"] == "ok"
+    assert scheduler.reports["optimize"]["idle_window"]
+    assert "analyzed" in scheduler.reports["optimize"]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_reports_busy_window(tmp_path):
+    """Тест отметки заданий, выполненных без периода простоя"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/busy.db")
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=1,
+        idle_wait=0.01,
+        is_idle=lambda: False,
+    )
+    reports = await scheduler.run_once()
+    await test_engine.dispose()
+
+    assert all(report["status"] == "ok" for report in reports.values())
+    assert not any(report["idle_window"] for report in reports.values())
+
+
+@pytest.mark.asyncio
+async def test_integrity_check_respects_budget(tmp_path):
+    """Тест прерывания проверки целостности по бюджету времени"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/budget.db")
+    async with test_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE items (data TEXT)")
+        await conn.exec_driver_sql("CREATE INDEX ix_items_data ON items (data)")
+        await conn.exec_driver_sql(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 2000) "
+            "INSERT INTO items SELECT hex(randomblob(200)) FROM n"
+        )
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=0,
+        idle_wait=0,
+    )
+    reports = await scheduler.run_once()
+
+    assert reports["integrity_check"]["status"] == "timeout"
+    assert reports["integrity_check"]["timed_out"]
+
+    # Прерванная проверка повторяется при следующем запуске, соединение исправно
+    scheduler.job_budget = 5
+    reports = await scheduler.run_once()
+    await test_engine.dispose()
+
+    assert reports["integrity_check"]["status"] == "ok"
+    assert reports["integrity_check"]["ok"]
+
+
+@pytest.mark.asyncio
+async def test_maintenance_leader_failover(tmp_path):
+    """Тест перехода обслуживания к другому процессу после остановки лидера"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/leader.db")
+    lock_path = str(tmp_path / "leader.db.maintenance.lock")
+
+    def make_scheduler():
+        return MaintenanceScheduler(
+            test_engine,
+            interval=0.01,
+            integrity_interval=3600,
+            vacuum_step_pages=16,
+            step_pause=0,
+            job_budget=1,
+            idle_wait=0,
+            leader=LeaderLock(lock_path),
+            leader_retry=0.01,
+            initial_delay=0.01,
+        )
+
+    first, second = make_scheduler(), make_scheduler()
+    first.start()
+    await asyncio.sleep(0.05)
+    second.start()
+    await asyncio.sleep(0.1)
+
+    assert first.stats()["leader"] and first.reports
+    assert not second.stats()["leader"] and not second.reports
+
+    await first.stop()
+    await asyncio.sleep(0.1)
+    await second.stop()
+    await test_engine.dispose()
+
+    assert second.reports
+
+
+@pytest.mark.asyncio
+async def test_optimize_analyzes_stale_tables(tmp_path):
+    """Тест сбора статистики планировщика для таблиц без статистики и с устаревшей"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/stats.db")
+    event.listen(test_engine.sync_engine, "connect", set_sqlite_pragmas)
+    async with test_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE items (value INTEGER)")
+        await conn.exec_driver_sql("CREATE INDEX ix_items_value ON items (value)")
+        await conn.exec_driver_sql(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 20000) "
+            "INSERT INTO items SELECT i % 100 FROM n"
+        )
+
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=5,
+        idle_wait=0,
+    )
+    reports = await scheduler.run_once()
+    assert reports["optimize"]["status"] == "ok"
+    assert reports["optimize"]["analyzed"]
+    async with test_engine.connect() as conn:
+        result = await conn.exec_driver_sql(
+            "SELECT stat FROM sqlite_stat1 WHERE idx = 'ix_items_value'"
+        )
+        assert result.scalar()
+
+    # Актуальная статистика повторно не собирается
+    reports = await scheduler.run_once()
+    assert reports["optimize"]["analyzed"] == []
+
+    # Контрольная точка в период простоя обрезает файл WAL
+    assert reports["wal_checkpoint"]["mode"] == "TRUNCATE"
+    assert (tmp_path / "stats.db-wal").stat().st_size == 0
+
+    # Количество строк выросло в четыре раза - статистика устарела
+    async with test_engine.begin() as conn:
+        for _ in range(2):
+            await conn.exec_driver_sql("INSERT INTO items SELECT value FROM items")
+    reports = await scheduler.run_once()
+    await test_engine.dispose()
+    assert "items" in str(reports["optimize"]["analyzed"])
+
+
+@pytest.mark.asyncio
+async def test_maintenance_runs_soon_after_start(tmp_path):
+    """Тест первого запуска обслуживания после начальной задержки, а не интервала"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/start.db")
+    scheduler = MaintenanceScheduler(
+        test_engine,
+        interval=3600,
+        integrity_interval=3600,
+        vacuum_step_pages=16,
+        step_pause=0,
+        job_budget=1,
+        idle_wait=0,
+        initial_delay=0.01,
+    )
+    scheduler.start()
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+    await test_engine.dispose()
+
+    assert scheduler.reports["optimize"]["status"] == "ok"
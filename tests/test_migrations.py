@@ -0,0 +1,126 @@
+"""
+Тесты версионирования схемы и прогрева при запуске
+"""
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base, set_sqlite_pragmas
+from app.core.migrations import SCHEMA_VERSION, ensure_schema, get_schema_version
+from app.core.warmup import StartupReport, prepare
+
+
+def make_engine(path):
+    """Создание движка для отдельного файла базы данных"""
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(test_engine.sync_engine, "connect", set_sqlite_pragmas)
+    return test_engine
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_migrated_once(tmp_path):
+    """Тест создания схемы с нуля и пропуска миграций при повторном запуске"""
+    test_engine = make_engine(tmp_path / "fresh.db")
+
+    assert await ensure_schema(test_engine) == list(range(1, SCHEMA_VERSION + 1))
+    assert await ensure_schema(test_engine) == []
+
+    async with test_engine.connect() as conn:
+        assert await get_schema_version(conn) == SCHEMA_VERSION
+        result = await conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+        tables = {row[0] for row in result}
+    await test_engine.dispose()
+
+    assert {"tasks", "tags", "task_tags", "schema_version"} <= tables
+
+
+def describe_schema(conn):
+    """Колонки и индексы таблиц моделей в базе данных"""
+    inspector = inspect(conn)
+    return {
+        table: (
+            [
+                (column["name"], column["nullable"])
+                for column in inspector.get_columns(table)
+            ],
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+        )
+        for table in Base.metadata.tables
+    }
+
+
+@pytest.mark.asyncio
+async def test_migrations_match_models(tmp_path):
+    """Тест совпадения схемы после миграций со схемой моделей"""
+    migrated_engine = make_engine(tmp_path / "migrated.db")
+    models_engine = make_engine(tmp_path / "models.db")
+
+    await ensure_schema(migrated_engine)
+    async with models_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with migrated_engine.connect() as conn:
+        migrated = await conn.run_sync(describe_schema)
+    async with models_engine.connect() as conn:
+        expected = await conn.run_sync(describe_schema)
+    await migrated_engine.dispose()
+    await models_engine.dispose()
+
+    assert set(expected) == {"tasks", "tags", "task_tags"}
+    assert migrated == expected
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_upgraded(tmp_path):
+    """Тест обновления базы, созданной до появления аренды и версионирования"""
+    test_engine = make_engine(tmp_path / "legacy.db")
+    async with test_engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TABLE tasks ("
+            "id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+            "description TEXT, completed BOOLEAN NOT NULL, "
+            "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+        )
+        await conn.exec_driver_sql(
+            "INSERT INTO tasks VALUES (1, 'Старая задача', NULL, 0, "
+            "'2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+        )
+
+    assert await ensure_schema(test_engine) == [1]
+
+    async with test_engine.connect() as conn:
+        result = await conn.exec_driver_sql("PRAGMA table_info(tasks)")
+        columns = {row[1] for row in result}
+        result = await conn.exec_driver_sql("SELECT title FROM tasks")
+        titles = [row[0] for row in result]
+    await test_engine.dispose()
+
+    assert {"lease_owner", "lease_expires_at"} <= columns
+    assert titles == ["Старая задача"]
+
+
+@pytest.mark.asyncio
+async def test_startup_report(tmp_path):
+    """Тест прогрева пула и запросов с измерением этапов запуска"""
+    test_engine = make_engine(tmp_path / "warmup.db")
+    report = StartupReport()
+
+    await prepare(
+        test_engine,
+        async_sessionmaker(test_engine, expire_on_commit=False),
+        report,
+        warmup_connections=3,
+    )
+    pooled = test_engine.pool.checkedin()
+    await test_engine.dispose()
+
+    stats = report.stats()
+    assert stats["migrations_applied"] == [1]
+    assert stats["warmup"]["connections"] == 3
+    assert stats["warmup"]["queries"] > 0
+    assert set(stats["phases_ms"]) == {"schema", "pool", "queries"}
+    assert stats["total_ms"] >= max(stats["phases_ms"].values())
+    assert pooled == 3
@@ -0,0 +1,123 @@
+"""
+Тесты формата MessagePack
+"""
+
+from datetime import datetime, timezone
+
+import msgpack
+import pytest
+from httpx import AsyncClient
+
+from app.core.database import create_tables
+from app.core.serialization import (
+    MSGPACK_MEDIA_TYPE,
+    negotiate_media_type,
+    packb,
+    unpackb,
+)
+from app.main import app
+
+MSGPACK_HEADERS = {"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE}
+
+
+def test_negotiate_media_type():
+    """Тест выбора формата ответа по заголовку Accept"""
+    assert negotiate_media_type("") == "application/json"
+    assert negotiate_media_type("*/*") == "application/json"
+    assert negotiate_media_type("application/json") == "application/json"
+    assert negotiate_media_type("application/msgpack") == MSGPACK_MEDIA_TYPE
+    assert negotiate_media_type("application/x-msgpack, */*") == MSGPACK_MEDIA_TYPE
+    assert (
+        negotiate_media_type("application/msgpack;q=0.5, application/json")
+        == "application/json"
+    )
+
+
+def test_datetime_is_native_timestamp():
+    """Тест кодирования дат в виде нативных timestamp"""
+    packed = packb({"created_at": datetime(2024, 1, 2, 3, 4, 5)})
+    raw = msgpack.unpackb(packed)
+    assert isinstance(raw["created_at"], msgpack.Timestamp)
+
+    decoded = unpackb(packed)["created_at"]
+    assert decoded.isoformat() == "2024-01-02T03:04:05+00:00"
+
+    aware = datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert unpackb(packb(aware)) == aware
+
+
+@pytest.mark.asyncio
+async def test_msgpack_crud():
+    """Тест создания, получения и обновления задачи в формате MessagePack"""
+    await create_tables()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/tasks/",
+            content=packb({"title": "Задача MessagePack", "description": "Описание"}),
+            headers=MSGPACK_HEADERS,
+        )
+        assert response.status_code == 201
+        assert response.headers["Content-Type"] == MSGPACK_MEDIA_TYPE
+        assert response.headers["Vary"] == "Accept"
+        task = unpackb(response.content)
+        assert task["title"] == "Задача MessagePack"
+        assert isinstance(task["created_at"], datetime)
+
+        response = await client.put(
+            f"/api/v1/tasks/{task['id']}",
+            content=packb({"completed": True}),
+            headers=MSGPACK_HEADERS,
+        )
+        assert response.status_code == 200
+        assert unpackb(response.content)["completed"] is True
+
+        # JSON клиенты получают JSON для той же задачи
+        response = await client.get(f"/api/v1/tasks/{task['id']}")
+        assert response.headers["Content-Type"] == "application/json"
+        assert response.headers["Vary"] == "Accept"
+        assert response.json()["completed"] is True
+
+        response = await client.get(
+            "/api/v1/tasks/?limit=5", headers={"Accept": MSGPACK_MEDIA_TYPE}
+        )
+        assert response.status_code == 200
+        assert response.headers["Vary"] == "Accept"
+        data = unpackb(response.content)
+        assert data["limit"] == 5
+        assert data["tasks"]
+
+
+@pytest.mark.asyncio
+async def test_msgpack_validation_errors():
+    """Тест ошибок валидации и декодирования тела MessagePack"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/tasks/", content=packb({"title": ""}), headers=MSGPACK_HEADERS
+        )
+        assert response.status_code == 422
+
+        response = await client.post(
+            "/api/v1/tasks/", content=b"\xc1", headers=MSGPACK_HEADERS
+        )
+        assert response.status_code == 400
+
+        # Бинарные значения (типы bin и ext) на месте строк
+        for payload in (
+            {"title": b"\xff\xfe"},
+            {"title": "Задача", "tags": [b"\xff"]},
+            {"title": msgpack.ExtType(5, b"\xff\xfe")},
+        ):
+            response = await client.post(
+                "/api/v1/tasks/", content=packb(payload), headers=MSGPACK_HEADERS
+            )
+            assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_json_list_varies_on_accept():
+    """Тест заголовка Vary у списка задач, в том числе при объединении запросов"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/tasks/?limit=3")
+        assert response.status_code == 200
+        assert "Accept" in response.headers["Vary"]
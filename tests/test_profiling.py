@@ -0,0 +1,127 @@
+"""
+Тесты профилирования запросов
+"""
+
+import asyncio
+import marshal
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.api.v1.endpoints import profiles
+from app.core import profiling
+from app.core.database import create_tables, engine
+from app.core.profiling import ProfilingMiddleware, install_db_timing
+from app.main import app
+
+
+@pytest.fixture
+def db_timing():
+    """
+    Фикстура для временного подключения учета времени запросов
+    """
+    install_db_timing(engine.sync_engine)
+    yield
+    event.remove(
+        engine.sync_engine, "before_cursor_execute", profiling._before_cursor_execute
+    )
+    event.remove(
+        engine.sync_engine, "after_cursor_execute", profiling._after_cursor_execute
+    )
+
+
+@pytest.mark.asyncio
+async def test_profiled_request_has_server_timing(db_timing):
+    """Тест профилирования запроса, помеченного заголовком"""
+    await create_tables()
+    profiled_app = ProfilingMiddleware(app, store=profiling.profile_store)
+
+    async with AsyncClient(app=profiled_app, base_url="http://test") as client:
+        await client.post("/api/v1/tasks/", json={"title": "Профилируемая задача"})
+
+        response = await client.get("/api/v1/tasks/?limit=5")
+        assert response.status_code == 200
+        assert "Server-Timing" not in response.headers
+
+        response = await client.get(
+            "/api/v1/tasks/?limit=5", headers={"X-Profile": "1"}
+        )
+        assert response.status_code == 200
+        assert len(response.json()["tasks"]) >= 1
+
+    timing = response.headers["Server-Timing"]
+    for metric in ("db;dur=", "validation;dur=", "serialization;dur=", "total;dur="):
+        assert metric in timing
+    # Список задач, количество и пакетная загрузка тегов
+    assert '"3 queries"' in timing
+
+    report, raw_stats = profiling.profile_store.get(response.headers["X-Profile-Id"])
+    assert "get_tasks" in report
+    assert marshal.loads(raw_stats)
+
+
+@pytest.mark.asyncio
+async def test_profiled_requests_are_not_coalesced(db_timing):
+    """Тест того, что конкурентные профилируемые запросы не объединяются"""
+    await create_tables()
+    profiled_app = ProfilingMiddleware(app, store=profiling.profile_store)
+
+    async with AsyncClient(app=profiled_app, base_url="http://test") as client:
+        await client.post("/api/v1/tasks/", json={"title": "Профилируемая задача"})
+        responses = await asyncio.gather(
+            *(
+                client.get("/api/v1/tasks/?limit=7", headers={"X-Profile": "1"})
+                for _ in range(5)
+            )
+        )
+
+    # Каждый запрос сам выполняет свои запросы к базе данных
+    for response in responses:
+        assert response.status_code == 200
+        assert '"3 queries"' in response.headers["Server-Timing"]
+
+
+@pytest.mark.asyncio
+async def test_profiling_token_required():
+    """Тест того, что при заданном токене профилирование требует его значения"""
+    profiled_app = ProfilingMiddleware(
+        app, store=profiling.ProfileStore(max_entries=1), token="secret"
+    )
+
+    async with AsyncClient(app=profiled_app, base_url="http://test") as client:
+        response = await client.get("/health", headers={"X-Profile": "1"})
+        assert "Server-Timing" not in response.headers
+
+        response = await client.get("/health", headers={"X-Profile": "secret"})
+        assert "X-Profile-Id" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_profile_download():
+    """Тест получения сохраненного отчета"""
+    profile_id = profiling.profile_store.add("отчет", marshal.dumps({}))
+    test_app = FastAPI()
+    test_app.include_router(profiles.router, prefix="/profiles")
+
+    async with AsyncClient(app=test_app, base_url="http://test") as client:
+        response = await client.get(f"/profiles/{profile_id}")
+        assert response.status_code == 200
+        assert response.text == "отчет"
+
+        response = await client.get(f"/profiles/{profile_id}?format=pstats")
+        assert response.status_code == 200
+        assert marshal.loads(response.content) == {}
+
+        response = await client.get("/profiles/unknown")
+        assert response.status_code == 404
+
+
+def test_store_keeps_latest_reports():
+    """Тест ограничения количества хранимых отчетов"""
+    store = profiling.ProfileStore(max_entries=2)
+    first = store.add("1", b"")
+    store.add("2", b"")
+    store.add("3", b"")
+    assert store.get(first) is None
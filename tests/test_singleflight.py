@@ -0,0 +1,117 @@
+"""
+Тесты объединения одинаковых конкурентных запросов
+"""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.cache import SingleFlight, task_list_flight
+from app.core.database import create_tables
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_execution():
+    """Тест того, что конкурентные вызовы выполняют операцию один раз"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+    assert results == [1] * 10
+    assert calls == 1
+    assert flight.coalesced == 9
+
+    # Без ttl завершенный результат не переиспользуется
+    assert await flight.do("key", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_starts_new_execution():
+    """Тест того, что после invalidate не используется старый результат"""
+    flight = SingleFlight(ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", load) == 1
+    assert await flight.do("key", load) == 1
+    assert flight.hits == 1
+
+    flight.invalidate()
+    assert await flight.do("key", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_and_not_cached():
+    """Тест передачи ошибки ожидающим вызовам"""
+    flight = SingleFlight(ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("ошибка")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.executions == 1
+
+    async def load():
+        return "ok"
+
+    assert await flight.do("key", load) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_followers():
+    """Тест того, что отмена лидера не ломает ожидающие вызовы"""
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    assert flight.executions == 2
+
+
+@pytest.mark.asyncio
+async def test_task_list_invalidated_on_mutation(monkeypatch):
+    """Тест того, что изменения задач сразу видны в списке"""
+    await create_tables()
+    monkeypatch.setattr(task_list_flight, "ttl", 60)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v1/tasks/?limit=1")
+        total = response.json()["total"]
+
+        response = await client.post("/api/v1/tasks/", json={"title": "Новая задача"})
+        task_id = response.json()["id"]
+        response = await client.get("/api/v1/tasks/?limit=1")
+        assert response.json()["total"] == total + 1
+        assert response.json()["tasks"][0]["id"] == task_id
+
+        await client.put(f"/api/v1/tasks/{task_id}", json={"title": "Измененная"})
+        response = await client.get("/api/v1/tasks/?limit=1")
+        assert response.json()["tasks"][0]["title"] == "Измененная"
+
+        await client.delete(f"/api/v1/tasks/{task_id}")
+        response = await client.get("/api/v1/tasks/?limit=1")
+        assert response.json()["total"] == total
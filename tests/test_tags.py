@@ -0,0 +1,168 @@
+"""
+Тесты тегов задач
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.database import create_tables, engine
+from app.main import app
+
+
+def unique_tag(prefix: str) -> str:
+    """Уникальное название тега, чтобы тесты не зависели от данных прошлых запусков"""
+    return f"{prefix}-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.mark.asyncio
+async def test_task_tags_are_normalized():
+    """Тест создания задачи с тегами и их нормализации"""
+    await create_tables()
+    tag = unique_tag("backend")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={
+                "title": "Задача с тегами",
+                "tags": [f"  {tag.upper()} ", tag, "Bug"],
+            },
+        )
+        assert response.status_code == 201
+        task = response.json()
+        assert task["tags"] == sorted([tag, "bug"])
+
+        # Теги заменяются целиком при обновлении
+        response = await client.put(
+            f"/api/v1/tasks/{task['id']}", json={"tags": ["bug"]}
+        )
+        assert response.status_code == 200
+        assert response.json()["tags"] == ["bug"]
+        assert datetime.fromisoformat(
+            response.json()["updated_at"]
+        ) > datetime.fromisoformat(task["updated_at"])
+
+        response = await client.put(
+            f"/api/v1/tasks/{task['id']}", json={"completed": True}
+        )
+        assert response.json()["tags"] == ["bug"]
+
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": "Задача", "tags": ["  "]}
+        )
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_filter_tasks_by_tags():
+    """Тест фильтрации задач по всем и по любому из тегов"""
+    await create_tables()
+    red, blue, green = unique_tag("red"), unique_tag("blue"), unique_tag("green")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        ids = {}
+        for title, tags in [
+            ("red", [red]),
+            ("red-blue", [red, blue]),
+            ("blue-green", [blue, green]),
+        ]:
+            response = await client.post(
+                "/api/v1/tasks/", json={"title": title, "tags": tags}
+            )
+            ids[title] = response.json()["id"]
+
+        response = await client.get(f"/api/v1/tasks/?tags={red}&tags={blue}")
+        data = response.json()
+        assert [task["id"] for task in data["tasks"]] == [ids["red-blue"]]
+        assert data["total"] == 1
+
+        response = await client.get(f"/api/v1/tasks/?any_tags={red},{green}")
+        data = response.json()
+        assert {task["id"] for task in data["tasks"]} == set(ids.values())
+        assert data["total"] == 3
+
+        # Фильтры сочетаются друг с другом и с пагинацией
+        response = await client.get(
+            f"/api/v1/tasks/?tags={blue}&any_tags={red},{green}&limit=1"
+        )
+        data = response.json()
+        assert data["total"] == 2
+        assert len(data["tasks"]) == 1
+
+        response = await client.get(f"/api/v1/tasks/?tags={unique_tag('none')}")
+        assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tags_loaded_in_one_query_per_page():
+    """Тест пакетной загрузки тегов для страницы задач (без N+1)"""
+    await create_tables()
+    tag = unique_tag("batch")
+    statements = []
+
+    def count_statement(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for i in range(5):
+            await client.post(
+                "/api/v1/tasks/", json={"title": f"Задача {i}", "tags": [tag, f"n{i}"]}
+            )
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            response = await client.get(f"/api/v1/tasks/?tags={tag}")
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert len(response.json()["tasks"]) == 5
+    assert all(len(task["tags"]) == 2 for task in response.json()["tasks"])
+    # Список задач, количество и одна пакетная загрузка тегов
+    assert len(statements) == 3
+
+
+@pytest.mark.asyncio
+async def test_tag_crud():
+    """Тест создания, переименования и удаления тега"""
+    await create_tables()
+    name, new_name = unique_tag("crud"), unique_tag("renamed")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/v1/tags/", json={"name": name})
+        assert response.status_code == 201
+        tag = response.json()
+        assert tag["name"] == name
+
+        response = await client.post("/api/v1/tags/", json={"name": name.upper()})
+        assert response.status_code == 409
+
+        response = await client.post(
+            "/api/v1/tasks/", json={"title": "Задача с тегом", "tags": [name]}
+        )
+        task_id = response.json()["id"]
+
+        response = await client.put(
+            f"/api/v1/tags/{tag['id']}", json={"name": new_name}
+        )
+        assert response.status_code == 200
+        assert response.json()["name"] == new_name
+
+        response = await client.get(f"/api/v1/tasks/{task_id}")
+        assert response.json()["tags"] == [new_name]
+
+        response = await client.get("/api/v1/tags/?limit=1000")
+        assert new_name in {tag["name"] for tag in response.json()["tags"]}
+
+        response = await client.delete(f"/api/v1/tags/{tag['id']}")
+        assert response.status_code == 204
+
+        # Удаленный тег снимается со всех задач
+        response = await client.get(f"/api/v1/tasks/{task_id}")
+        assert response.json()["tags"] == []
+
+        response = await client.get(f"/api/v1/tags/{tag['id']}")
+        assert response.status_code == 404
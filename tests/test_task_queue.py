@@ -0,0 +1,184 @@
+"""
+Тесты очереди задач: аренда, продление и освобождение
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_db, set_sqlite_pragmas
+from app.main import app
+
+
+@pytest_asyncio.fixture
+async def queue_client(tmp_path):
+    """
+    HTTP клиент с отдельной базой данных для каждого теста
+
+    Каждый запрос получает собственную сессию, чтобы конкурентные запросы
+    выполнялись на разных соединениях, как в работающем приложении.
+    """
+    test_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/queue.db")
+    event.listen(test_engine.sync_engine, "connect", set_sqlite_pragmas)
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(
+        test_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+    await test_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_claim_tasks_is_exclusive(queue_client):
+    """Тест того, что одна задача не арендуется двумя воркерами"""
+    for i in range(10):
+        await queue_client.post("/api/v1/tasks/", json={"title": f"Задача очереди {i}"})
+
+    # Воркеры арендуют задачи одновременно, задач на всех не хватает
+    workers = [f"worker-{i}" for i in range(8)]
+    responses = await asyncio.gather(
+        *(
+            queue_client.post(
+                "/api/v1/tasks/claim", json={"worker_id": worker, "limit": 3}
+            )
+            for worker in workers
+        )
+    )
+    assert all(response.status_code == 200 for response in responses)
+
+    claimed = []
+    for worker, response in zip(workers, responses):
+        body = response.json()
+        assert body["worker_id"] == worker
+        assert all(task["lease_owner"] == worker for task in body["tasks"])
+        assert all(task["lease_expires_at"] for task in body["tasks"])
+        claimed.extend(task["id"] for task in body["tasks"])
+
+    assert len(claimed) == 10
+    assert len(set(claimed)) == 10
+
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-late", "limit": 2}
+    )
+    assert response.json()["tasks"] == []
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_completed_tasks(queue_client):
+    """Тест того, что выполненные задачи не арендуются"""
+    await queue_client.post(
+        "/api/v1/tasks/", json={"title": "Выполненная", "completed": True}
+    )
+
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-c", "limit": 10}
+    )
+    assert response.status_code == 200
+    assert response.json()["tasks"] == []
+
+
+@pytest.mark.asyncio
+async def test_extend_and_release_lease(queue_client):
+    """Тест продления и освобождения аренды"""
+    response = await queue_client.post(
+        "/api/v1/tasks/", json={"title": "Задача с арендой"}
+    )
+    updated_at = response.json()["updated_at"]
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-d"}
+    )
+    task = response.json()["tasks"][0]
+    task_id = task["id"]
+    # Аренда не меняет время обновления задачи
+    assert task["updated_at"] == updated_at
+
+    # Чужой воркер не может продлить или освободить аренду
+    response = await queue_client.post(
+        f"/api/v1/tasks/{task_id}/lease/extend", json={"worker_id": "worker-e"}
+    )
+    assert response.status_code == 409
+    response = await queue_client.post(
+        f"/api/v1/tasks/{task_id}/lease/release", json={"worker_id": "worker-e"}
+    )
+    assert response.status_code == 409
+
+    response = await queue_client.post(
+        f"/api/v1/tasks/{task_id}/lease/extend",
+        json={"worker_id": "worker-d", "lease_seconds": 120},
+    )
+    assert response.status_code == 200
+    assert response.json()["lease_expires_at"] > task["lease_expires_at"]
+    assert response.json()["updated_at"] == updated_at
+
+    response = await queue_client.post(
+        f"/api/v1/tasks/{task_id}/lease/release", json={"worker_id": "worker-d"}
+    )
+    assert response.status_code == 200
+    assert response.json()["lease_owner"] is None
+    assert response.json()["updated_at"] == updated_at
+
+    # Освобожденная задача снова доступна для аренды
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-e"}
+    )
+    assert [task["id"] for task in response.json()["tasks"]] == [task_id]
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(queue_client):
+    """Тест повторной аренды задачи с истекшей арендой"""
+    response = await queue_client.post("/api/v1/tasks/", json={"title": "Просроченная"})
+    task_id = response.json()["id"]
+
+    await queue_client.post(
+        "/api/v1/tasks/claim",
+        json={"worker_id": "worker-f", "limit": 1, "lease_seconds": 1},
+    )
+    # Новые задачи в очереди не должны мешать выдаче просроченной
+    for i in range(5):
+        await queue_client.post("/api/v1/tasks/", json={"title": f"Новая {i}"})
+    await asyncio.sleep(1.1)
+
+    # Истекшую аренду нельзя продлить, задача достается другому воркеру
+    response = await queue_client.post(
+        f"/api/v1/tasks/{task_id}/lease/extend", json={"worker_id": "worker-f"}
+    )
+    assert response.status_code == 409
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-g", "limit": 1}
+    )
+    tasks = response.json()["tasks"]
+    assert [task["id"] for task in tasks] == [task_id]
+    assert tasks[0]["lease_owner"] == "worker-g"
+
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-g", "limit": 3}
+    )
+    assert task_id not in [task["id"] for task in response.json()["tasks"]]
+
+
+@pytest.mark.asyncio
+async def test_lease_not_found(queue_client):
+    """Тест операций с арендой несуществующей задачи"""
+    response = await queue_client.post(
+        "/api/v1/tasks/999999/lease/extend", json={"worker_id": "worker-h"}
+    )
+    assert response.status_code == 404
+
+    response = await queue_client.post(
+        "/api/v1/tasks/claim", json={"worker_id": "worker-h", "limit": 0}
+    )
+    assert response.status_code == 422